@@ -0,0 +1,140 @@
+import asyncio
+import importlib
+import json
+import logging
+import threading
+import time
+
+from app.core.config import settings
+
+
+WARMUP_WAIT_SECONDS = 60.0
+
+_boot_started = time.perf_counter()
+
+logger = logging.getLogger("app.startup")
+
+
+class LazyApp:
+    def __init__(self, target: str = "app.main:app"):
+        self._module_name, self._attribute = target.split(":", 1)
+        self._app = None
+        self._error: BaseException | None = None
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.timings: dict[str, float] = {}
+
+    def warm_up(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load, name="app-warmup", daemon=True)
+            self._thread.start()
+
+    def _load(self) -> None:
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(self._module_name)
+            self._app = getattr(module, self._attribute)
+        except BaseException as exc:  # pragma: no cover - surfaced through /healthz and 503s
+            self._error = exc
+        finally:
+            finished = time.perf_counter()
+            self.timings = {
+                "importMs": round((finished - started) * 1000, 1),
+                "sinceBootMs": round((finished - _boot_started) * 1000, 1),
+            }
+            if self.timings["sinceBootMs"] > settings.startup_budget_ms:
+                logger.warning(
+                    "startup budget exceeded (run python -m benchmarks.startup_bench for details)",
+                    extra={**self.timings, "startupBudgetMs": settings.startup_budget_ms},
+                )
+            self._ready.set()
+
+    async def _wait_ready(self) -> bool:
+        self.warm_up()
+        if not self._ready.is_set():
+            await asyncio.to_thread(self._ready.wait, WARMUP_WAIT_SECONDS)
+        return self._app is not None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(scope, receive, send)
+            return
+        if scope["type"] == "http" and scope["path"] == "/healthz":
+            await self._healthz(send)
+            return
+        if not await self._wait_ready():
+            if scope["type"] == "http":
+                await _send_json(send, 503, {"status": "unavailable", "error": str(self._error)})
+            else:
+                await send({"type": "websocket.close", "code": 1013})
+            return
+        await self._app(scope, receive, send)
+
+    async def _lifespan(self, scope, receive, send) -> None:
+        # Startup completes at once so the port opens before app.main is imported. The inner app's
+        # own lifespan runs after warm-up, and shutdown is forwarded so its hooks still run.
+        shutdown: asyncio.Queue = asyncio.Queue()
+        inner: asyncio.Task | None = None
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.warm_up()
+                inner = asyncio.ensure_future(self._inner_lifespan(scope, shutdown))
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if inner is not None:
+                    if self._app is None:
+                        inner.cancel()
+                    else:
+                        shutdown.put_nowait(message)
+                    await asyncio.gather(inner, return_exceptions=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _inner_lifespan(self, scope, shutdown: asyncio.Queue) -> None:
+        if not await self._wait_ready():
+            return
+        messages: asyncio.Queue = asyncio.Queue()
+        messages.put_nowait({"type": "lifespan.startup"})
+
+        async def receive():
+            if messages.empty():
+                return await shutdown.get()
+            return messages.get_nowait()
+
+        async def send(message) -> None:
+            if message["type"].endswith(".failed"):
+                logger.error("app lifespan failed", extra={"event": message["type"], "detail": message.get("message")})
+
+        await self._app(scope, receive, send)
+
+    async def _healthz(self, send) -> None:
+        self.warm_up()
+        ready = self._app is not None
+        body = {
+            "status": "ok" if self._error is None else "error",
+            "ready": ready,
+            "uptimeMs": round((time.perf_counter() - _boot_started) * 1000, 1),
+            "startup": self.timings,
+            "startupBudgetMs": settings.startup_budget_ms,
+        }
+        await _send_json(send, 200 if self._error is None else 500, body)
+
+
+async def _send_json(send, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"cache-control", b"no-store"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+app = LazyApp()
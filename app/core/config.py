@@ -28,6 +28,7 @@ class Settings:
     deepseek_model: str = os.getenv("DEEPSEEK_MODEL", "deepseek-chat")
 
     youtube_api_key: str = os.getenv("YOUTUBE_API_KEY", "")
+    youtube_api_base_url: str = os.getenv("YOUTUBE_API_BASE_URL", "https://www.googleapis.com/youtube/v3")
     google_cse_api_key: str = os.getenv("GOOGLE_CSE_API_KEY", "")
     google_cse_id: str = os.getenv("GOOGLE_CSE_ID", "")
 
@@ -36,6 +37,8 @@ class Settings:
         "deepseek" if os.getenv("DEEPSEEK_API_KEY") else "mymemory",
     )
     mymemory_email: str = os.getenv("MYMEMORY_EMAIL", "")
+    mymemory_base_url: str = os.getenv("MYMEMORY_BASE_URL", "https://api.mymemory.translated.net")
+    translate_hedge_after: float = float(os.getenv("TRANSLATE_HEDGE_AFTER", "6"))
 
     invidious_base_url: str = os.getenv("INVIDIOUS_BASE_URL", "https://yewtu.be")
     invidious_instances: list[str] = field(
@@ -54,6 +57,44 @@ class Settings:
 
     http_timeout: float = float(os.getenv("HTTP_TIMEOUT", "18"))
     max_concurrency: int = int(os.getenv("MAX_CONCURRENCY", "6"))
+    request_deadline: float = float(os.getenv("REQUEST_DEADLINE", "45"))
+    startup_budget_ms: float = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+    summary_token_budget: int = int(os.getenv("SUMMARY_TOKEN_BUDGET", "3000"))
+    summary_mode: str = os.getenv("SUMMARY_MODE", "single")
+    # Per-language cap for hierarchical map steps; 0 means SUMMARY_TOKEN_BUDGET / number of languages.
+    summary_map_token_budget: int = int(os.getenv("SUMMARY_MAP_TOKEN_BUDGET", "0"))
+    speculative_summary: bool = os.getenv("SPECULATIVE_SUMMARY", "false").lower() in {"1", "true", "yes"}
+    # 0 waits for every language; a smaller value starts earlier but is redone if more languages finish.
+    speculative_summary_min_languages: int = int(os.getenv("SPECULATIVE_SUMMARY_MIN_LANGUAGES", "0"))
+    speculative_summary_budget: int = int(os.getenv("SPECULATIVE_SUMMARY_BUDGET", "200000"))
+
+    comment_store_path: str = os.getenv("COMMENT_STORE_PATH", "data/comments.sqlite3")
+    comment_store_ttl: float = float(os.getenv("COMMENT_STORE_TTL", "21600"))
+
+    state_backend_url: str = os.getenv("STATE_BACKEND_URL", "memory://")
+    video_cache_ttl: float = float(os.getenv("VIDEO_CACHE_TTL", "600"))
+    result_handle_ttl: float = float(os.getenv("RESULT_HANDLE_TTL", "900"))
+    result_store_max_bytes: int = int(os.getenv("RESULT_STORE_MAX_BYTES", str(64 * 1024 * 1024)))
+    memory_cache_max_bytes: int = int(os.getenv("MEMORY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    memory_limit_mb: int = int(os.getenv("MEMORY_LIMIT_MB", "0"))
+    summary_cache_ttl: float = float(os.getenv("SUMMARY_CACHE_TTL", "86400"))
+    rate_limit_per_minute: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "0"))
+    # Proxies (IPs or CIDRs) whose X-Forwarded-For is believed; "*" trusts whatever peer connects.
+    trusted_proxies: list[str] = field(
+        default_factory=lambda: [
+            value.strip() for value in os.getenv("TRUSTED_PROXIES", "127.0.0.1,::1").split(",") if value.strip()
+        ]
+    )
+    youtube_daily_quota: int = int(os.getenv("YOUTUBE_DAILY_QUOTA", "0"))
+
+    job_workers: int = int(os.getenv("JOB_WORKERS", "8"))
+    job_queue_size: int = int(os.getenv("JOB_QUEUE_SIZE", "64"))
+    job_ttl: float = float(os.getenv("JOB_TTL", "900"))
+
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    profile_sample_rate: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    profile_dir: str = os.getenv("PROFILE_DIR", "data/profiles")
+    admin_token: str = os.getenv("ADMIN_TOKEN", "")
 
 
 settings = Settings()
@@ -1,7 +1,15 @@
 import asyncio
+import hashlib
+import ipaddress
+import logging
+import math
+import secrets
+import time
+from contextlib import asynccontextmanager
 from typing import Any
 
-from fastapi import FastAPI, HTTPException
+import httpx
+from fastapi import FastAPI, Header, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -9,14 +17,54 @@ from pydantic import BaseModel
 
 from app.core.config import settings
 from app.core.constants import LANGUAGES
+from app.core.responses import FastJSONResponse, json_response
 from app.services.comment_filter import filter_comments
+from app.services.deadline import DeadlineExceeded, current_deadline, deadline_scope, within_budget
+from app.services.dedup import collapse_duplicates, exact_groups
 from app.services.http_client import get_client
-from app.services.summarize import summarize_comments_local, summarize_comments_overview
+from app.services.jobs import JobQueue, QueueFullError
+from app.services.memory import MemoryPressureError, admit_request, memory_stats
+from app.services.ranking import merge_candidates, rank_candidates
+from app.services.records import Video
+from app.services.resilience import upstream_metrics
+from app.services.result_store import get_result_store
+from app.services.search_coordinator import coordinator_scope, current_coordinator
+from app.services.shared_state import allow_request, close_backend, get_backend, single_flight
+from app.services.speculation import get_speculations
+from app.services.store import close_store, get_store
+from app.services.summarize import (
+    summarize_comments_hierarchical,
+    summarize_comments_local,
+    summarize_comments_overview,
+    summarize_languages,
+)
+from app.services.telemetry import (
+    configure_logging,
+    maybe_profile,
+    profile_sample_rate,
+    request_context,
+    set_profile_sample_rate,
+    upstream_summary,
+)
+from app.services.summary_payload import build_language_payloads, build_summary_payload, estimate_tokens
+from app.services.topics import diff_snapshots, extract_sentiment, known_videos, snapshot_cutoff, topic_key
 from app.services.translate import translate_text, translate_texts
-from app.services.utils import clip_text
+from app.services.translation_providers import provider_stats
 from app.services.youtube import fetch_comments, search_videos
 
-app = FastAPI(title="Global Perspective Engine")
+configure_logging()
+logger = logging.getLogger("app.main")
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    await job_queue.shutdown()
+    close_store()
+    await close_backend()
+
+
+app = FastAPI(title="Global Perspective Engine", default_response_class=FastJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,12 +79,60 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 class QueryRequest(BaseModel):
     query: str
+    include_comments: bool = False
+
+
+class JobRequest(BaseModel):
+    query: str
+    include_comments: bool = False
+    # 0 runs first; values outside 0-9 are clamped.
+    priority: int = 5
 
 
 class SummaryRequest(BaseModel):
     query: str
-    items: list[dict[str, Any]]
+    items: list[dict[str, Any]] = []
+    result_id: str | None = None
+    keys: list[str] | None = None
     scope: str | None = None
+    mode: str | None = None
+
+
+class TopicRequest(BaseModel):
+    query: str
+    summarize: bool = False
+
+
+class TopicRefreshRequest(BaseModel):
+    summarize: bool = False
+
+
+class ProfilingRequest(BaseModel):
+    sample_rate: float
+
+
+@app.middleware("http")
+async def request_telemetry(request: Request, call_next):
+    with request_context(request.headers.get("x-request-id")) as request_id:
+        started = time.perf_counter()
+        status = 500
+        try:
+            with maybe_profile(await profile_sample_rate(), request_id):
+                response = await call_next(request)
+            status = response.status_code
+            response.headers["X-Request-ID"] = request_id
+            return response
+        finally:
+            logger.info(
+                "request",
+                extra={
+                    "method": request.method,
+                    "path": request.url.path,
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                    "upstream": upstream_summary(),
+                },
+            )
 
 
 @app.get("/")
@@ -44,59 +140,446 @@ async def root():
     return FileResponse("app/static/index.html")
 
 
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok", "ready": True}
+
+
+@app.get("/api/translation/providers")
+async def translation_providers():
+    return {"preferred": settings.translate_provider, "providers": provider_stats()}
+
+
+@app.get("/api/results/stats")
+async def result_store_stats():
+    return {**get_result_store().stats(), "speculation": get_speculations().stats()}
+
+
+@app.get("/api/memory")
+async def memory():
+    return {**memory_stats(), "results": get_result_store().stats(), "stateCache": get_backend().stats()}
+
+
+@app.get("/api/upstreams")
+async def upstreams():
+    return {"upstreams": upstream_metrics()}
+
+
+@app.post("/api/admin/profiling")
+async def update_profiling(request: ProfilingRequest, x_admin_token: str = Header(default="")):
+    if not settings.admin_token or not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    rate = min(1.0, max(0.0, request.sample_rate))
+    await set_profile_sample_rate(rate)
+    return {"sampleRate": rate}
+
+
 @app.post("/api/video")
-async def analyze_video(request: QueryRequest):
+async def analyze_video(request: QueryRequest, http_request: Request):
     query = request.query.strip()
     if not query:
         raise HTTPException(status_code=400, detail="Query is required")
+    await _enforce_rate_limit(http_request)
 
-    async with get_client() as client:
-        tasks = [fetch_video_for_lang(client, lang, query) for lang in LANGUAGES]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    cache_key = f"video:{hashlib.sha1(query.encode('utf-8')).hexdigest()}:{int(request.include_comments)}"
 
-    return {"query": query, "items": results}
+    async def analyze() -> dict[str, Any]:
+        # Admission is checked only when new work starts; cached results are still served.
+        _admit_request()
+        return await _analyze_query(query, request.include_comments, speculate_key=cache_key)
 
+    result = await single_flight(
+        cache_key,
+        analyze,
+        ttl=settings.video_cache_ttl,
+        lock_ttl=settings.request_deadline + 5,
+        cacheable=lambda value: settings.video_cache_ttl > 0 and not value.get("partial"),
+    )
+    result_id = get_result_store().put(result)
+    get_speculations().link(cache_key, result_id)
+    return json_response(http_request, {**result, "resultId": result_id})
 
-@app.post("/api/summary/comments")
-async def summarize_comments(request: SummaryRequest):
+
+@app.post("/api/jobs/video", status_code=202)
+async def submit_video_job(request: JobRequest, http_request: Request):
     query = request.query.strip()
     if not query:
         raise HTTPException(status_code=400, detail="Query is required")
+    await _enforce_rate_limit(http_request)
+    _admit_request()
 
-    payload = _build_comments_summary_payload(request.items)
-    if not payload:
-        return {"summary": "暂无可用评论可总结。"}
+    try:
+        job = job_queue.submit(query, request.include_comments, min(9, max(0, request.priority)))
+    except QueueFullError as exc:
+        raise HTTPException(
+            status_code=429,
+            detail="Job queue is full",
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+    return {"jobId": job.job_id, "status": job.status, "languages": [lang.key for lang in LANGUAGES]}
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_video_job(job_id: str, http_request: Request):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return json_response(http_request, job.snapshot())
+
+
+@app.websocket("/api/jobs/{job_id}/ws")
+async def stream_video_job(websocket: WebSocket, job_id: str):
+    await websocket.accept()
+    job = job_queue.get(job_id)
+    if job is None:
+        await websocket.close(code=4404)
+        return
+
+    events: asyncio.Queue = asyncio.Queue()
+    job.subscribers.append(events)
+    try:
+        snapshot = job.snapshot()
+        for item in snapshot["items"]:
+            await websocket.send_json({"type": "item", "item": item})
+        if snapshot["status"] == "done":
+            await websocket.send_json({"type": "done", "partial": snapshot["partial"]})
+        else:
+            while True:
+                event = await events.get()
+                await websocket.send_json(event)
+                if event["type"] == "done":
+                    break
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        job.subscribers.remove(events)
+
+
+@app.post("/api/topics")
+async def track_topic(request: TopicRequest, http_request: Request):
+    query = request.query.strip()
+    if not query:
+        raise HTTPException(status_code=400, detail="Query is required")
+    await _enforce_rate_limit(http_request)
+    store = _require_topic_store()
+
+    topic_id = topic_key(query)
+    latest = await store.load_snapshot(topic_id)
+    if latest is None:
+        _admit_request()
+        snapshot = await _analyze_topic(query, None, request.summarize)
+        taken_at = await store.save_snapshot(topic_id, query, snapshot)
+        latest = {"topicId": topic_id, "query": query, "takenAt": taken_at, "snapshot": snapshot}
+    return json_response(http_request, latest)
+
+
+@app.get("/api/topics/{topic_id}")
+async def get_topic(topic_id: str, http_request: Request):
+    latest = await _require_topic_store().load_snapshot(topic_id)
+    if latest is None:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    return json_response(http_request, latest)
+
+
+@app.post("/api/topics/{topic_id}/refresh")
+async def refresh_topic(topic_id: str, request: TopicRefreshRequest, http_request: Request):
+    await _enforce_rate_limit(http_request)
+    store = _require_topic_store()
+    previous = await store.load_snapshot(topic_id)
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Topic not found")
+
+    _admit_request()
+    snapshot = await _analyze_topic(previous["query"], previous, request.summarize)
+    taken_at = await store.save_snapshot(topic_id, previous["query"], snapshot)
+    return json_response(
+        http_request,
+        {
+            "topicId": topic_id,
+            "query": previous["query"],
+            "takenAt": taken_at,
+            "previousTakenAt": previous["takenAt"],
+            "snapshot": snapshot,
+            "diff": diff_snapshots(previous["snapshot"], snapshot),
+        },
+    )
 
-    scope = request.scope or ("local" if len(request.items) == 1 else "global")
+
+@app.post("/api/summary/comments")
+async def summarize_comments(request: SummaryRequest, http_request: Request):
+    query = request.query.strip()
+    if not query:
+        raise HTTPException(status_code=400, detail="Query is required")
+    await _enforce_rate_limit(http_request)
+
+    items = _summary_items(request)
+    scope = request.scope or ("local" if len(items) == 1 else "global")
+    mode = (request.mode or settings.summary_mode).lower()
+    hierarchical = scope != "local" and mode == "hierarchical"
+
+    if request.result_id and scope == "global" and not hierarchical and request.keys is None:
+        covered = {item.get("key") for item in items if item.get("videos")}
+        speculative = await get_speculations().attach(request.result_id, covered)
+        if speculative is not None:
+            return json_response(http_request, speculative)
+
+    if hierarchical:
+        language_payloads = _map_payloads(items)
+        # The reduce prompt is only known once the map steps finish; it is added below.
+        token_estimate = sum(estimate_tokens(text) for _, text in language_payloads)
+        has_payload = bool(language_payloads)
+    else:
+        payload, token_estimate = build_summary_payload(items, settings.summary_token_budget)
+        has_payload = bool(payload)
+    if not has_payload:
+        return json_response(http_request, {"summary": "暂无可用评论可总结。", "tokenEstimate": 0})
 
     async with get_client() as client:
         try:
-            if scope == "local":
+            if hierarchical:
+                summary, reduce_tokens = await summarize_comments_hierarchical(client, query, language_payloads)
+                token_estimate += reduce_tokens
+            elif scope == "local":
                 summary = await summarize_comments_local(client, query, payload)
             else:
                 summary = await summarize_comments_overview(client, query, payload)
         except Exception:
+            logger.exception("summary failed", extra={"scope": scope, "mode": mode})
             summary = "暂时无法生成 AI 总结（可能是 API 限速或密钥问题），请稍后再试。"
 
-    return {"summary": summary}
+    return json_response(http_request, {"summary": summary, "tokenEstimate": token_estimate})
+
+
+def _map_payloads(items: list[dict[str, Any]]) -> list[tuple[str, str]]:
+    # A fixed cap per language, so each map payload (and its cache key) depends only on that
+    # language's comments and a change in one language re-runs just its map step and the reduce.
+    cap = settings.summary_map_token_budget or settings.summary_token_budget // len(LANGUAGES)
+    return build_language_payloads(items, cap, split=False)
+
+
+def _summary_items(request: SummaryRequest) -> list[dict[str, Any]]:
+    if not request.result_id:
+        return request.items
+    result = get_result_store().get(request.result_id)
+    if result is None:
+        # 410 tells the client to fall back to posting the items it already holds.
+        raise HTTPException(status_code=410, detail="Result expired")
+    items = result.get("items", [])
+    if request.keys is not None:
+        wanted = set(request.keys)
+        items = [item for item in items if item.get("key") in wanted]
+    return items
+
+
+async def _analyze_query(
+    query: str,
+    include_comments: bool,
+    known: dict[str, list[dict[str, Any]]] | None = None,
+    published_after: str | None = None,
+    speculate_key: str | None = None,
+) -> dict[str, Any]:
+    known = known or {}
+    with deadline_scope(settings.request_deadline), coordinator_scope(len(LANGUAGES)) as coordinator:
+        async with get_client() as client:
+            tasks = [
+                fetch_video_for_lang(
+                    client,
+                    lang,
+                    query,
+                    include_comments=include_comments,
+                    known_videos=known.get(lang.key),
+                    published_after=published_after,
+                )
+                for lang in LANGUAGES
+            ]
+            if speculate_key and settings.speculative_summary and settings.summary_mode == "single":
+                tasks = _with_speculation(tasks, speculate_key, query)
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+    logger.info("search coordination", extra=coordinator.summary())
+
+    for lang, item in zip(LANGUAGES, results):
+        if isinstance(item, BaseException):
+            logger.error("language analysis failed", exc_info=item, extra={"lang": lang.key})
+    items = [
+        item
+        if isinstance(item, dict)
+        else {"key": lang.key, "label": lang.label, "emoji": lang.emoji, "error": str(item)}
+        for lang, item in zip(LANGUAGES, results)
+    ]
+    partial = any(item.get("partial") for item in items)
+    return {"query": query, "items": items, "partial": partial}
+
+
+def _with_speculation(tasks: list, key: str, query: str) -> list:
+    finished: list[dict[str, Any]] = []
+    completed = 0
+    minimum = settings.speculative_summary_min_languages
+    threshold = len(tasks) if minimum <= 0 else min(len(tasks), minimum)
+
+    async def track(task):
+        nonlocal completed
+        try:
+            item = await task
+        except Exception as exc:
+            item = exc
+        completed += 1
+        if isinstance(item, dict) and item.get("videos"):
+            finished.append(item)
+        # Start early at the threshold, and again once every language is in: start() replaces an
+        # early summary that missed later languages, since it could never attach to the result.
+        if finished and (len(finished) == threshold or completed == len(tasks)):
+            try:
+                await get_speculations().start(key, query, list(finished))
+            except Exception:
+                logger.warning("speculative summary not started", exc_info=True)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    return [track(task) for task in tasks]
+
+
+async def _analyze_topic(query: str, previous: dict[str, Any] | None, summarize: bool) -> dict[str, Any]:
+    if previous is None:
+        snapshot = await _analyze_query(query, False)
+    else:
+        snapshot = await _analyze_query(
+            query,
+            False,
+            known=known_videos(previous["snapshot"]),
+            published_after=snapshot_cutoff(previous["takenAt"]),
+        )
+    if summarize:
+        async with get_client() as client:
+            snapshot["sentiments"] = await _language_sentiments(client, query, snapshot["items"])
+    return snapshot
+
+
+async def _language_sentiments(client, query: str, items: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    keys = {item.get("label"): item.get("key") for item in items}
+    language_payloads = _map_payloads(items)
+    summaries = await summarize_languages(client, query, language_payloads)
+    sentiments = {}
+    for (label, _), summary in zip(language_payloads, summaries):
+        if isinstance(summary, BaseException):
+            logger.warning("topic sentiment failed", exc_info=summary, extra={"lang": keys.get(label)})
+            continue
+        sentiments[keys.get(label)] = {"summary": summary, "sentiment": extract_sentiment(summary)}
+    return sentiments
+
+
+def _require_topic_store():
+    store = get_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Topic tracking requires COMMENT_STORE_PATH")
+    return store
+
+
+async def _run_language_job(lang, query: str, include_comments: bool) -> dict[str, Any]:
+    with deadline_scope(settings.request_deadline):
+        async with get_client() as client:
+            return await fetch_video_for_lang(client, lang, query, include_comments=include_comments)
+
+
+job_queue = JobQueue(_run_language_job)
+
+
+def _admit_request() -> None:
+    try:
+        admit_request()
+    except MemoryPressureError as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
 
 
-async def fetch_video_for_lang(client, lang, query: str) -> dict[str, Any]:
+_TRUSTED_PROXY_NETWORKS = [
+    ipaddress.ip_network(value, strict=False) for value in settings.trusted_proxies if value != "*"
+]
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in _TRUSTED_PROXY_NETWORKS)
+
+
+def _client_ip(http_request: Request) -> str:
+    peer = http_request.client.host if http_request.client else "unknown"
+    if "*" not in settings.trusted_proxies and not _is_trusted_proxy(peer):
+        return peer
+    # Walk X-Forwarded-For from the nearest hop back: the first address our own proxies did not
+    # add is the client. Anything further left was sent by the client and may be forged.
+    client = peer
+    for hop in reversed(http_request.headers.get("x-forwarded-for", "").split(",")):
+        hop = hop.strip()
+        if not hop:
+            continue
+        client = hop
+        if not _is_trusted_proxy(hop):
+            break
+    return client
+
+
+async def _enforce_rate_limit(http_request: Request) -> None:
+    client_ip = _client_ip(http_request)
+    if not await allow_request(client_ip, settings.rate_limit_per_minute):
+        retry_after = max(1, math.ceil(60 / settings.rate_limit_per_minute))
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+async def fetch_video_for_lang(
+    client,
+    lang,
+    query: str,
+    include_comments: bool = False,
+    known_videos: list[dict[str, Any]] | None = None,
+    published_after: str | None = None,
+) -> dict[str, Any]:
+    partial = False
     try:
-        localized_query = await translate_text(client, query, "auto", lang.mymemory_lang)
-        candidates = await search_videos(client, localized_query or query, lang, limit=20)
+        try:
+            localized_query = await within_budget(
+                translate_text(client, query, "auto", lang.mymemory_lang),
+                share=0.15,
+            )
+        except (DeadlineExceeded, httpx.TimeoutException):
+            localized_query, partial = query, True
+
+        try:
+            candidates = await within_budget(
+                search_videos(client, localized_query or query, lang, limit=20, published_after=published_after),
+                share=0.3,
+            )
+        except (DeadlineExceeded, httpx.TimeoutException):
+            candidates, partial = [], True
+        if known_videos:
+            candidates = rank_candidates(merge_candidates([candidates, known_videos]))
+        coordinator = current_coordinator()
+        if coordinator is not None:
+            coordinator.expect_comments([video["videoId"] for video in candidates])
         if not candidates:
             return {
                 "key": lang.key,
                 "label": lang.label,
                 "emoji": lang.emoji,
-                "error": "未找到视频或未配置 YouTube API Key",
+                "error": "请求超时，未能获取视频" if partial else "未找到视频或未配置 YouTube API Key",
+                "partial": partial,
             }
 
         per_video = 5
         target_videos = 10
 
-        selected = await _collect_videos_with_comments(
+        selected, collect_partial = await _collect_videos_with_comments(
             client,
             lang,
             candidates,
@@ -104,54 +587,44 @@ async def fetch_video_for_lang(client, lang, query: str) -> dict[str, Any]:
             target_videos,
             strict=False,
         )
+        partial = partial or collect_partial
 
         if not selected:
             return {
                 "key": lang.key,
                 "label": lang.label,
                 "emoji": lang.emoji,
-                "error": "未找到可用评论内容",
+                "error": "请求超时，未能获取评论" if partial else "未找到可用评论内容",
+                "partial": partial,
             }
 
-        structured_videos, all_comments = await _translate_comment_batches(client, selected, lang)
+        translate_partial = await _translate_comment_batches(client, selected, lang)
+        partial = partial or translate_partial
 
-        return {
+        videos = [video.to_dict() for video in selected]
+        result = {
             "key": lang.key,
             "label": lang.label,
             "emoji": lang.emoji,
-            "videos": structured_videos,
-            "comments": all_comments,
-            "commentCount": len(all_comments),
-            "videoCount": len(structured_videos),
+            "videos": videos,
+            "commentCount": sum(len(video.comments) for video in selected),
+            "videoCount": len(videos),
+            "partial": partial,
         }
+        if include_comments:
+            result["comments"] = [comment for video in videos for comment in video["comments"]]
+        return result
     except Exception as exc:  # pragma: no cover - keep resilient
+        logger.exception("language fetch failed", extra={"lang": lang.key})
         return {
             "key": lang.key,
             "label": lang.label,
             "emoji": lang.emoji,
             "error": str(exc),
+            "partial": partial,
         }
 
 
-async def _translate_comments(client, comments: list[dict], lang) -> list[dict]:
-    if not comments:
-        return []
-
-    originals = [comment.get("original", "") for comment in comments]
-    results = await translate_texts(client, originals, lang.mymemory_lang, "zh-CN")
-
-    translated = []
-    for comment, zh in zip(comments, results):
-        translated.append(
-            {
-                "original": comment.get("original", ""),
-                "translated": zh or comment.get("original", ""),
-                "likeCount": comment.get("likeCount", 0),
-            }
-        )
-    return translated
-
-
 async def _collect_videos_with_comments(
     client,
     lang,
@@ -159,7 +632,7 @@ async def _collect_videos_with_comments(
     per_video: int,
     target: int,
     strict: bool = True,
-):
+) -> tuple[list[Video], bool]:
     semaphore = asyncio.Semaphore(settings.max_concurrency)
 
     async def fetch_for(video):
@@ -175,20 +648,51 @@ async def _collect_videos_with_comments(
                 lang,
                 max_results=60,
             )
-        filtered = filter_comments(raw, lang.key, per_video, use_lang_match=strict)
+        needs_save = any(comment.verdict is None for comment in raw)
+        filtered = filter_comments(raw, lang.key, len(raw), use_lang_match=strict)
+        filtered = collapse_duplicates(filtered)[:per_video]
+        store = get_store()
+        if store is not None and needs_save:
+            await store.save_comments(video["videoId"], lang.key, raw)
         if not filtered:
             return None
-        return {"video": video, "comments": filtered}
-
-    tasks = [fetch_for(video) for video in candidates]
-    results = await asyncio.gather(*tasks)
+        return Video(video, filtered)
+
+    if not candidates:
+        return [], False
+
+    tasks = [asyncio.ensure_future(fetch_for(video)) for video in candidates]
+    deadline = current_deadline()
+    timeout = deadline.budget(share=0.6) if deadline else None
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+
+    partial = bool(pending)
+    results = []
+    error = None
+    for task in tasks:
+        if task not in done:
+            continue
+        exc = task.exception()
+        if exc is None:
+            results.append(task.result())
+            continue
+        # One broken video (comments disabled, a 403, a malformed page) only costs that video.
+        partial = True
+        if not isinstance(exc, httpx.TimeoutException):
+            logger.warning("video comments failed", exc_info=exc, extra={"lang": lang.key})
+            if error is None:
+                error = exc
+    if error is not None and not any(results):
+        raise error
 
     selected = []
     fallback = []
     for item in results:
         if not item:
             continue
-        if len(item["comments"]) >= per_video:
+        if len(item.comments) >= per_video:
             selected.append(item)
         else:
             fallback.append(item)
@@ -201,58 +705,31 @@ async def _collect_videos_with_comments(
             if len(selected) >= target:
                 break
 
-    return selected
-
-
-async def _translate_comment_batches(client, selected: list[dict], lang):
-    texts = []
-    refs = []
-    for video_index, item in enumerate(selected):
-        for comment_index, comment in enumerate(item["comments"]):
-            refs.append((video_index, comment_index))
-            texts.append(comment.get("original", ""))
-
-    translations = await translate_texts(client, texts, lang.mymemory_lang, "zh-CN")
-
-    translated_videos = []
-    all_comments = []
-    cursor = 0
-    for video_index, item in enumerate(selected):
-        video = item["video"]
-        comments = []
-        for comment in item["comments"]:
-            zh = translations[cursor] if cursor < len(translations) else comment.get("original", "")
-            comments.append(
-                {
-                    "original": comment.get("original", ""),
-                    "translated": zh or comment.get("original", ""),
-                    "likeCount": comment.get("likeCount", 0),
-                }
-            )
-            cursor += 1
-        translated_videos.append({**video, "comments": comments})
-        all_comments.extend(comments)
+    return selected, partial
 
-    return translated_videos, all_comments
 
+async def _translate_comment_batches(client, selected: list[Video], lang) -> bool:
+    pending = [comment for video in selected for comment in video.comments if not comment.translated]
+    groups = exact_groups([comment.original for comment in pending])
+    representatives = sorted(set(groups))
+    texts = [pending[index].original for index in representatives]
 
-def _build_comments_summary_payload(items: list[dict[str, Any]]) -> str:
-    payload = []
-    for item in items:
-        label = item.get("label", "")
-        comments = item.get("comments") or []
-        if not comments:
-            continue
-        sample = comments[:12]
-        joined = " / ".join(
-            [
-                clip_text(c.get("translated") or c.get("original", ""), 200)
-                for c in sample
-                if c.get("translated") or c.get("original")
-            ]
+    partial = False
+    try:
+        translations = await within_budget(
+            translate_texts(client, texts, lang.mymemory_lang, "zh-CN"),
         )
-        if joined:
-            payload.append(f"{label}: {joined}")
-    if not payload:
-        return ""
-    return "\n".join(payload)
+    except (DeadlineExceeded, httpx.TimeoutException):
+        translations, partial = [], True
+
+    by_group = dict(zip(representatives, translations))
+    for comment, group in zip(pending, groups):
+        comment.translated = by_group.get(group) or None
+
+    store = get_store()
+    if store is not None and pending:
+        for video in selected:
+            await store.save_video(video.video_id, lang.key, video.meta)
+            await store.save_translations(video.video_id, lang.key, video.comments)
+
+    return partial
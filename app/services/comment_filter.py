@@ -1,6 +1,7 @@
 import re
 
-from app.services.language_match import is_language_match
+from app.services.language_match import match_languages
+from app.services.records import Comment
 
 
 LINK_PATTERN = re.compile(r"(https?://|www\.|\b\w+\.\w{2,})", re.IGNORECASE)
@@ -120,30 +121,38 @@ LANGUAGE_KEYWORDS = {
 
 
 def filter_comments(
-    comments: list[dict],
+    comments: list[Comment],
     lang_key: str,
     limit: int,
     use_lang_match: bool = False,
-) -> list[dict]:
+) -> list[Comment]:
     filtered = []
     for comment in comments:
-        text = (comment.get("original") or "").strip()
-        if not text:
-            continue
-        if _contains_link(text):
-            continue
-        if _is_low_info(text):
-            continue
-        if _contains_blacklist(text, lang_key):
-            continue
-        if use_lang_match and not is_language_match(lang_key, text):
-            continue
-        filtered.append(comment)
-
-    filtered.sort(key=lambda x: x.get("likeCount", 0), reverse=True)
+        if comment.verdict is None:
+            comment.verdict = passes_filters(comment.original, lang_key)
+        if comment.verdict:
+            filtered.append(comment)
+    if use_lang_match and filtered:
+        matches = match_languages(lang_key, [comment.original for comment in filtered])
+        filtered = [comment for comment, match in zip(filtered, matches) if match]
+
+    filtered.sort(key=lambda x: x.like_count, reverse=True)
     return filtered[:limit]
 
 
+def passes_filters(text: str, lang_key: str) -> bool:
+    text = (text or "").strip()
+    if not text:
+        return False
+    if _contains_link(text):
+        return False
+    if _is_low_info(text):
+        return False
+    if _contains_blacklist(text, lang_key):
+        return False
+    return True
+
+
 def _contains_link(text: str) -> bool:
     return bool(LINK_PATTERN.search(text))
 
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from app.core.config import settings
+
+
+MIN_STAGE_TIMEOUT = 0.1
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    pass
+
+
+@dataclass
+class Deadline:
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def budget(self, share: float = 1.0) -> float:
+        return max(MIN_STAGE_TIMEOUT, self.remaining() * max(0.0, min(share, 1.0)))
+
+    def timeout(self, share: float = 1.0) -> float:
+        return min(settings.http_timeout, self.budget(share))
+
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float):
+    deadline = Deadline.after(seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Deadline | None:
+    return _current_deadline.get()
+
+
+def deadline_expired() -> bool:
+    deadline = current_deadline()
+    return deadline is not None and deadline.expired()
+
+
+def http_timeout(share: float = 1.0) -> float:
+    deadline = current_deadline()
+    if deadline is None:
+        return settings.http_timeout
+    return deadline.timeout(share)
+
+
+async def within_budget(awaitable, share: float = 1.0):
+    deadline = current_deadline()
+    if deadline is None:
+        return await awaitable
+    if deadline.expired():
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Request deadline exceeded")
+    try:
+        return await asyncio.wait_for(awaitable, timeout=deadline.budget(share))
+    except asyncio.TimeoutError as exc:
+        raise DeadlineExceeded("Request deadline exceeded") from exc
+
+
+async def sleep_within_budget(seconds: float) -> bool:
+    deadline = current_deadline()
+    if deadline is not None and deadline.remaining() <= seconds:
+        return False
+    await asyncio.sleep(seconds)
+    return True
@@ -0,0 +1,86 @@
+import heapq
+import re
+
+from app.services.records import Comment
+
+
+SHINGLE_SIZE = 3
+SKETCH_SIZE = 16
+BAND_ROWS = 2
+DEFAULT_THRESHOLD = 0.7
+MIN_DEDUP_CHARS = 3
+MASK64 = (1 << 64) - 1
+
+NORMALIZE_PATTERN = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+    return NORMALIZE_PATTERN.sub(" ", (text or "").lower()).strip()
+
+
+def sketch(text: str, size: int = SKETCH_SIZE) -> tuple[int, ...]:
+    normalized = normalize(text)
+    if len(normalized) <= SHINGLE_SIZE:
+        return (hash(normalized) & MASK64,)
+    shingles = {normalized[i : i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+    return tuple(heapq.nsmallest(size, {hash(shingle) & MASK64 for shingle in shingles}))
+
+
+def similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    if left == right:
+        return 1.0
+    left_set, right_set = set(left), set(right)
+    union = sorted(left_set | right_set)[: max(len(left), len(right))]
+    return sum(1 for value in union if value in left_set and value in right_set) / len(union)
+
+
+def exact_groups(texts: list[str]) -> list[int]:
+    # Groups only texts that normalize identically. Emoji-, punctuation-only and very short texts
+    # all normalize to (nearly) nothing, so they never share a group.
+    first: dict[str, int] = {}
+    groups = []
+    for index, text in enumerate(texts):
+        key = normalize(text)
+        groups.append(first.setdefault(key, index) if len(key) > MIN_DEDUP_CHARS else index)
+    return groups
+
+
+def find_duplicate_groups(texts: list[str], threshold: float = DEFAULT_THRESHOLD) -> list[int]:
+    # Near-duplicates by MinHash similarity. Negations and small edits stay above the threshold,
+    # so use this for weighting only, never to hide a comment or reuse its translation.
+    parents = list(range(len(texts)))
+
+    def find(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    sketches = [sketch(text) for text in texts]
+    buckets: dict[tuple, int] = {}
+    for index, signature in enumerate(sketches):
+        if len(normalize(texts[index])) <= MIN_DEDUP_CHARS:
+            continue
+        for start in range(0, max(1, len(signature) - BAND_ROWS + 1), BAND_ROWS):
+            band = (start, *signature[start : start + BAND_ROWS])
+            other = buckets.setdefault(band, index)
+            if other == index:
+                continue
+            root, other_root = find(index), find(other)
+            if root == other_root:
+                continue
+            if similarity(signature, sketches[other]) >= threshold:
+                parents[max(root, other_root)] = min(root, other_root)
+    return [find(index) for index in range(len(texts))]
+
+
+def collapse_duplicates(comments: list[Comment]) -> list[Comment]:
+    groups = exact_groups([comment.original for comment in comments])
+    kept = []
+    for index, (comment, group) in enumerate(zip(comments, groups)):
+        if group == index:
+            kept.append(comment)
+        else:
+            representative = comments[group]
+            representative.duplicates += comment.duplicates + 1
+    return kept
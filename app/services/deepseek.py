@@ -1,6 +1,7 @@
-import asyncio
-
 from app.core.config import settings
+from app.services.deadline import deadline_expired
+from app.services.resilience import RETRYABLE_STATUS, resilient_request
+from app.services.shared_state import count_usage
 
 
 class DeepSeekError(RuntimeError):
@@ -15,6 +16,8 @@ def _build_url(path: str) -> str:
 async def chat(client, messages, temperature=0.2, max_tokens=800):
     if not settings.deepseek_api_key:
         raise DeepSeekError("Missing DEEPSEEK_API_KEY")
+    if deadline_expired():
+        raise DeepSeekError("DeepSeek request deadline exceeded")
 
     payload = {
         "model": settings.deepseek_model,
@@ -22,27 +25,23 @@ async def chat(client, messages, temperature=0.2, max_tokens=800):
         "temperature": temperature,
         "max_tokens": max_tokens,
     }
-    last_error = None
-    for attempt in range(3):
-        response = await client.post(
-            _build_url("chat/completions"),
-            headers={
-                "Authorization": f"Bearer {settings.deepseek_api_key}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-        )
-
-        if response.status_code in {401, 429, 500, 502, 503, 504}:
-            last_error = f"DeepSeek transient error {response.status_code}"
-            if attempt < 2:
-                await asyncio.sleep(1.5 * (attempt + 1))
-                continue
-        response.raise_for_status()
-        data = response.json()
-        try:
-            return data["choices"][0]["message"]["content"].strip()
-        except (KeyError, IndexError, TypeError) as exc:
-            raise DeepSeekError("Unexpected DeepSeek response format") from exc
-
-    raise DeepSeekError(last_error or "DeepSeek request failed")
+    response = await resilient_request(
+        client,
+        "deepseek",
+        "POST",
+        _build_url("chat/completions"),
+        headers={
+            "Authorization": f"Bearer {settings.deepseek_api_key}",
+            "Content-Type": "application/json",
+        },
+        json=payload,
+        before_attempt=lambda: count_usage("deepseek"),
+    )
+    if response.status_code in RETRYABLE_STATUS:
+        raise DeepSeekError(f"DeepSeek transient error {response.status_code}")
+    response.raise_for_status()
+    data = response.json()
+    try:
+        return data["choices"][0]["message"]["content"].strip()
+    except (KeyError, IndexError, TypeError) as exc:
+        raise DeepSeekError("Unexpected DeepSeek response format") from exc
@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 import httpx
 
 from app.core.config import settings
+from app.services.telemetry import on_request, on_response
 
 
 @asynccontextmanager
@@ -14,5 +15,10 @@ async def get_client():
             "Chrome/122.0.0.0 Safari/537.36"
         )
     }
-    async with httpx.AsyncClient(timeout=settings.http_timeout, headers=headers, follow_redirects=True) as client:
+    async with httpx.AsyncClient(
+        timeout=settings.http_timeout,
+        headers=headers,
+        follow_redirects=True,
+        event_hooks={"request": [on_request], "response": [on_response]},
+    ) as client:
         yield client
@@ -0,0 +1,140 @@
+import asyncio
+import contextvars
+import itertools
+import logging
+import math
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+from app.core.constants import LANGUAGES
+
+
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_DONE = "done"
+
+DEFAULT_TASK_SECONDS = 15.0
+
+logger = logging.getLogger("app.jobs")
+
+
+class QueueFullError(RuntimeError):
+    def __init__(self, retry_after: int):
+        super().__init__("Job queue is full")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    job_id: str
+    query: str
+    include_comments: bool
+    priority: int
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    items: dict[str, dict[str, Any]] = field(default_factory=dict)
+    subscribers: list[asyncio.Queue] = field(default_factory=list)
+
+    @property
+    def status(self) -> str:
+        if len(self.items) >= len(LANGUAGES):
+            return JOB_STATUS_DONE
+        return JOB_STATUS_RUNNING if self.items else JOB_STATUS_QUEUED
+
+    def snapshot(self) -> dict[str, Any]:
+        items = [self.items[lang.key] for lang in LANGUAGES if lang.key in self.items]
+        return {
+            "jobId": self.job_id,
+            "query": self.query,
+            "status": self.status,
+            "items": items,
+            "pending": [lang.key for lang in LANGUAGES if lang.key not in self.items],
+            "partial": any(item.get("partial") for item in items),
+        }
+
+    def publish(self, event: dict[str, Any]) -> None:
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+
+class JobQueue:
+    def __init__(self, runner: Callable[[Any, str, bool], Awaitable[dict[str, Any]]]):
+        self._runner = runner
+        self._queue: asyncio.PriorityQueue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._jobs: dict[str, Job] = {}
+        self._sequence = itertools.count()
+        self._task_seconds = DEFAULT_TASK_SECONDS
+
+    def _ensure_started(self) -> asyncio.PriorityQueue:
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue(maxsize=settings.job_queue_size)
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < settings.job_workers:
+            # Workers outlive the request that happened to start them, so they must not inherit
+            # its request ID, upstream counters or deadline.
+            self._workers.append(contextvars.Context().run(asyncio.create_task, self._work()))
+        return self._queue
+
+    def submit(self, query: str, include_comments: bool = False, priority: int = 5) -> Job:
+        queue = self._ensure_started()
+        self._purge()
+        if queue.maxsize - queue.qsize() < len(LANGUAGES):
+            raise QueueFullError(self.retry_after())
+
+        job = Job(uuid.uuid4().hex, query, include_comments, priority)
+        self._jobs[job.job_id] = job
+        for lang in LANGUAGES:
+            queue.put_nowait((priority, next(self._sequence), job.job_id, lang))
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        self._purge()
+        return self._jobs.get(job_id)
+
+    def retry_after(self) -> int:
+        depth = self._queue.qsize() if self._queue else 0
+        workers = max(1, settings.job_workers)
+        return max(1, math.ceil(depth / workers * self._task_seconds))
+
+    async def shutdown(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _work(self) -> None:
+        queue = self._queue
+        while True:
+            _, _, job_id, lang = await queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                started = time.monotonic()
+                try:
+                    item = await self._runner(lang, job.query, job.include_comments)
+                except Exception as exc:
+                    logger.exception("job task failed", extra={"job_id": job_id, "lang": lang.key})
+                    item = {"key": lang.key, "label": lang.label, "emoji": lang.emoji, "error": str(exc)}
+                self._task_seconds = 0.8 * self._task_seconds + 0.2 * (time.monotonic() - started)
+                job.items[lang.key] = item
+                job.publish({"type": "item", "item": item})
+                if job.status == JOB_STATUS_DONE:
+                    job.finished_at = time.time()
+                    job.publish({"type": "done", "partial": job.snapshot()["partial"]})
+            finally:
+                queue.task_done()
+
+    def _purge(self) -> None:
+        cutoff = time.time() - settings.job_ttl
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
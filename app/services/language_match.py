@@ -1,43 +1,171 @@
+import json
+import math
 import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 
 
-KANA = re.compile(r"[\u3040-\u30ff]")
-CJK = re.compile(r"[\u4e00-\u9fff]")
-HANGUL = re.compile(r"[\uac00-\ud7af]")
+PROFILE_PATH = Path(__file__).with_name("language_profiles.json")
+PROFILE_SIZE = 400
+MIN_LATIN_LETTERS = 12
+MIN_CONFIDENCE = 0.12
 
+SCRIPT_LANGUAGES = {
+    "hangul": ("ko",),
+    "kana": ("ja",),
+    "han": ("zh", "ja"),
+    "latin": ("en", "de", "fr", "es", "pt"),
+}
+CJK_SCRIPT_WEIGHT = 3
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
 SCRIPT_PATTERNS = {
-    "zh": CJK,
-    "ko": HANGUL,
+    "hangul": re.compile(r"[\uac00-\ud7af\u1100-\u11ff]"),
+    "kana": re.compile(r"[\u3040-\u30ff]"),
+    "han": re.compile(r"[\u4e00-\u9fff]"),
+    "latin": re.compile(r"[A-Za-z\u00c0-\u00d6\u00d8-\u00f6\u00f8-\u024f]"),
 }
 
-NON_LATIN = re.compile(r"[\u4e00-\u9fff\u3040-\u30ff\uac00-\ud7af\u0400-\u04ff]")
-LATIN = re.compile(r"[A-Za-z]")
+
+@dataclass(slots=True)
+class Detection:
+    lang: str | None
+    script: str | None
+    confidence: float
+
+
+def _script_counts(text: str) -> Counter:
+    counts = Counter()
+    letters = sum(map(str.isalpha, text))
+    if not letters:
+        return counts
+    if text.isascii():
+        counts["latin"] = letters
+        return counts
+    for script, pattern in SCRIPT_PATTERNS.items():
+        found = len(pattern.findall(text))
+        if found:
+            counts[script] = found
+            letters -= found
+    if letters > 0:
+        counts["other"] = letters
+    return counts
+
+
+def _dominant_script(counts: Counter) -> str | None:
+    if not counts:
+        return None
+    if counts["kana"]:
+        # Kana never appears in Chinese, so any kana next to kanji means Japanese.
+        counts = counts.copy()
+        counts["kana"] += counts.pop("han", 0)
+    return max(
+        counts,
+        key=lambda script: counts[script] * (1 if script in ("latin", "other") else CJK_SCRIPT_WEIGHT),
+    )
+
+
+def extract_ngrams(text: str) -> list[str]:
+    ngrams = []
+    extend = ngrams.extend
+    for word in WORD_PATTERN.findall(text.lower()):
+        padded = f" {word} "
+        extend(word)
+        extend([padded[start : start + size] for size in (2, 3) for start in range(len(padded) - size + 1)])
+    return ngrams
+
+
+def build_profile(text: str, size: int = PROFILE_SIZE) -> dict:
+    counts = Counter(extract_ngrams(text))
+    total = sum(counts.values()) or 1
+    return {
+        "floor": round(math.log(0.5 / total), 3),
+        "ngrams": {gram: round(math.log(count / total), 3) for gram, count in counts.most_common(size)},
+    }
+
+
+def build_profiles(corpus: dict[str, str], size: int = PROFILE_SIZE) -> dict:
+    return {
+        "ngramSizes": [1, 2, 3],
+        "languages": {lang: build_profile(text, size) for lang, text in corpus.items()},
+    }
+
+
+@lru_cache(maxsize=1)
+def load_profiles() -> dict[str, tuple[tuple[str, ...], list[float], dict[str, tuple[float, ...]]]]:
+    # Per script group: ngram -> log-prob gain over each language's floor, so scoring is one lookup per ngram.
+    languages = json.loads(PROFILE_PATH.read_text(encoding="utf-8"))["languages"]
+    groups = {}
+    for script, langs in SCRIPT_LANGUAGES.items():
+        if len(langs) < 2:
+            continue
+        floors = [languages[lang]["floor"] for lang in langs]
+        grams = set().union(*(languages[lang]["ngrams"] for lang in langs))
+        table = {
+            gram: tuple(
+                languages[lang]["ngrams"].get(gram, floor) - floor
+                for lang, floor in zip(langs, floors)
+            )
+            for gram in grams
+        }
+        groups[script] = (langs, floors, table)
+    return groups
+
+
+def detect_language(text: str) -> Detection:
+    return detect_languages([text])[0]
+
+
+def detect_languages(texts: list[str]) -> list[Detection]:
+    profiles = load_profiles()
+    memo: dict[str, Detection] = {}
+    results = []
+    for text in texts:
+        detection = memo.get(text)
+        if detection is None:
+            detection = memo[text] = _detect(text, profiles)
+        results.append(detection)
+    return results
+
+
+def _detect(text: str, profiles: dict) -> Detection:
+    script = _dominant_script(_script_counts(text or ""))
+    candidates = SCRIPT_LANGUAGES.get(script, ())
+    if not candidates:
+        return Detection(None, script, 0.0)
+    if len(candidates) == 1:
+        return Detection(candidates[0], script, 1.0)
+
+    ngrams = extract_ngrams(text)
+    if not ngrams:
+        return Detection(candidates[0], script, 0.0)
+    langs, floors, table = profiles[script]
+    rows = [table[gram] for gram in ngrams if gram in table]
+    gains = [sum(column) for column in zip(*rows)] if rows else [0.0] * len(langs)
+    count = len(ngrams)
+    scores = sorted(((floor + gain / count, lang) for lang, floor, gain in zip(langs, floors, gains)), reverse=True)
+    return Detection(scores[0][1], script, scores[0][0] - scores[1][0])
 
 
 def is_language_match(lang_key: str, text: str) -> bool:
-    if not text:
-        return True
-    sample = text.strip()
-    if lang_key == "ja":
-        if KANA.search(sample):
-            return True
-        if CJK.search(sample) and not HANGUL.search(sample):
-            return True
-        return False
+    return match_languages(lang_key, [text])[0]
 
-    pattern = SCRIPT_PATTERNS.get(lang_key)
-    if pattern:
-        return bool(pattern.search(sample))
 
-    if len(sample) < 6:
-        non_latin_count = len(NON_LATIN.findall(sample))
-        latin_count = len(LATIN.findall(sample))
-        if non_latin_count >= 1 and latin_count == 0:
-            return False
-        return True
+def match_languages(lang_key: str, texts: list[str]) -> list[bool]:
+    samples = [(text or "").strip() for text in texts]
+    detections = detect_languages(samples)
+    return [_matches(lang_key, sample, detection) for sample, detection in zip(samples, detections)]
+
 
-    non_latin_count = len(NON_LATIN.findall(sample))
-    latin_count = len(LATIN.findall(sample))
-    if non_latin_count >= 3 and latin_count <= 2:
+def _matches(lang_key: str, sample: str, detection: Detection) -> bool:
+    if not sample or detection.script is None:
+        return True
+    if lang_key not in SCRIPT_LANGUAGES.get(detection.script, ()):
         return False
-    return True
+    if detection.script != "latin":
+        return True
+    if sum(map(str.isalpha, sample)) < MIN_LATIN_LETTERS:
+        return True
+    return detection.lang == lang_key or detection.confidence < MIN_CONFIDENCE
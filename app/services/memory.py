@@ -0,0 +1,70 @@
+import logging
+import os
+import time
+import tracemalloc
+
+from app.core.config import settings
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+
+MEMORY_CHECK_INTERVAL = 1.0
+RETRY_AFTER = 5
+
+logger = logging.getLogger("app.memory")
+
+_last_check: tuple[int | None, float] | None = None
+_rejected = 0
+
+
+class MemoryPressureError(RuntimeError):
+    def __init__(self, in_use: int):
+        super().__init__("Server is under memory pressure")
+        self.in_use = in_use
+        self.retry_after = RETRY_AFTER
+
+
+def memory_in_use() -> int | None:
+    # Resident set size where the platform exposes it; otherwise the traced Python heap
+    # (only available while tracemalloc is running, e.g. under the memory benchmark).
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    return None
+
+
+def _sampled_memory_in_use() -> int | None:
+    global _last_check
+    now = time.monotonic()
+    if _last_check is None or now - _last_check[1] >= MEMORY_CHECK_INTERVAL:
+        _last_check = (memory_in_use(), now)
+    return _last_check[0]
+
+
+def admit_request() -> None:
+    global _rejected
+    limit = settings.memory_limit_mb * 1024 * 1024
+    if limit <= 0:
+        return
+    in_use = _sampled_memory_in_use()
+    if in_use is not None and in_use > limit:
+        _rejected += 1
+        logger.warning("request shed under memory pressure", extra={"inUse": in_use, "limit": limit})
+        raise MemoryPressureError(in_use)
+
+
+def memory_stats() -> dict[str, int | None]:
+    return {
+        "inUse": memory_in_use(),
+        "limit": settings.memory_limit_mb * 1024 * 1024 or None,
+        "rejected": _rejected,
+    }
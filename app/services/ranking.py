@@ -0,0 +1,196 @@
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from math import log10
+
+_numpy = None
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROS_PER_DAY = 86_400_000_000
+MISSING_TIMESTAMP = -(2**62)
+
+
+@dataclass(frozen=True)
+class RankingWeights:
+    views: float = 0.6
+    relevance: float = 0.25
+    recency: float = 0.15
+    comments: float = 0.08
+    lang_match: float = 0.12
+    low_view_threshold: float = 0.15
+    low_view_penalty: float = 0.05
+    recency_window_days: int = 365
+
+
+DEFAULT_WEIGHTS = RankingWeights()
+
+
+@dataclass
+class CandidateColumns:
+    view_log: array
+    rank: array
+    published: array
+    has_comments: array
+    lang_match: array
+
+    @classmethod
+    def from_candidates(cls, candidates: list[dict]) -> "CandidateColumns":
+        view_log = array(
+            "d",
+            [
+                float(item["viewLog"]) if "viewLog" in item else log10(int(item.get("viewCount", 0) or 0) + 1)
+                for item in candidates
+            ],
+        )
+        rank = array("d", [float(item.get("rank", 0)) for item in candidates])
+        published = _parse_timestamps([item.get("publishedAt") or "" for item in candidates])
+        has_comments = array("d", [1.0 if item.get("commentCount", 0) > 0 else 0.0 for item in candidates])
+        lang_match = array("d", [1.0 if item.get("langMatch") else 0.0 for item in candidates])
+        return cls(view_log, rank, published, has_comments, lang_match)
+
+    def __len__(self) -> int:
+        return len(self.view_log)
+
+
+def score_candidates(
+    candidates: list[dict],
+    weights: RankingWeights = DEFAULT_WEIGHTS,
+    now: datetime | None = None,
+) -> list[float]:
+    if not candidates:
+        return []
+    columns = CandidateColumns.from_candidates(candidates)
+    now_us = _to_micros(now or datetime.now(timezone.utc))
+    if load_numpy() is not None:
+        return _score_numpy(columns, weights, now_us)
+    return _score_python(columns, weights, now_us)
+
+
+def rank_candidates(
+    candidates: list[dict],
+    limit: int | None = None,
+    weights: RankingWeights = DEFAULT_WEIGHTS,
+    now: datetime | None = None,
+) -> list[dict]:
+    scores = score_candidates(candidates, weights, now)
+    for item, score in zip(candidates, scores):
+        item["score"] = score
+    ranked = sorted(candidates, key=lambda x: x.get("score", 0), reverse=True)
+    return ranked if limit is None else ranked[:limit]
+
+
+def merge_candidates(candidate_lists: list[list[dict]]) -> list[dict]:
+    merged: dict[str, dict] = {}
+    for candidates in candidate_lists:
+        for item in candidates:
+            video_id = item.get("videoId")
+            if not video_id:
+                continue
+            existing = merged.get(video_id)
+            if existing is None:
+                merged[video_id] = dict(item)
+                continue
+            existing["rank"] = min(existing.get("rank", 0), item.get("rank", 0))
+            existing["langMatch"] = bool(existing.get("langMatch")) or bool(item.get("langMatch"))
+            for key in ("viewCount", "commentCount", "viewLog"):
+                if key in item:
+                    existing[key] = max(existing.get(key, 0), item[key])
+    return list(merged.values())
+
+
+def load_numpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - optional acceleration
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def _score_python(columns: CandidateColumns, weights: RankingWeights, now_us: int) -> list[float]:
+    max_view_log = max(columns.view_log) if len(columns) else 0.0
+    window = weights.recency_window_days
+    w_views, w_relevance, w_recency = weights.views, weights.relevance, weights.recency
+    w_comments, w_lang_match = weights.comments, weights.lang_match
+    threshold, penalty = weights.low_view_threshold, weights.low_view_penalty
+    scores = []
+    for view_log, rank, published, has_comments, lang_match in zip(
+        columns.view_log,
+        columns.rank,
+        columns.published,
+        columns.has_comments,
+        columns.lang_match,
+    ):
+        view_score = (view_log / max_view_log) if max_view_log > 0 else 0.0
+        recency_score = 0.0
+        if published != MISSING_TIMESTAMP:
+            days = max(0, (now_us - published) // MICROS_PER_DAY)
+            recency_score = max(0.0, 1.0 - min(days, window) / window)
+        score = view_score * w_views + 1.0 / (rank + 1) * w_relevance + recency_score * w_recency
+        if view_score < threshold:
+            score -= penalty
+        score += has_comments * w_comments
+        score += lang_match * w_lang_match
+        scores.append(score)
+    return scores
+
+
+def _score_numpy(columns: CandidateColumns, weights: RankingWeights, now_us: int) -> list[float]:
+    np = load_numpy()
+    view_log = np.frombuffer(columns.view_log, dtype=np.float64)
+    rank = np.frombuffer(columns.rank, dtype=np.float64)
+    published = np.frombuffer(columns.published, dtype=np.int64)
+    has_comments = np.frombuffer(columns.has_comments, dtype=np.float64)
+    lang_match = np.frombuffer(columns.lang_match, dtype=np.float64)
+
+    max_view_log = view_log.max()
+    if max_view_log > 0:
+        view_score = view_log / max_view_log
+    else:
+        view_score = np.zeros_like(view_log)
+
+    window = weights.recency_window_days
+    valid = published != MISSING_TIMESTAMP
+    days = np.maximum(0, (now_us - np.where(valid, published, now_us)) // MICROS_PER_DAY)
+    recency_score = np.where(valid, np.maximum(0.0, 1.0 - np.minimum(days, window) / window), 0.0)
+    relevance_score = 1.0 / (rank + 1)
+
+    score = view_score * weights.views + relevance_score * weights.relevance + recency_score * weights.recency
+    score = np.where(view_score < weights.low_view_threshold, score - weights.low_view_penalty, score)
+    score = score + has_comments * weights.comments
+    score = score + lang_match * weights.lang_match
+    return score.tolist()
+
+
+def _parse_timestamps(values: list[str]) -> array:
+    np = load_numpy()
+    if np is not None and all(not value or (len(value) == 20 and value[-1] == "Z") for value in values):
+        try:
+            parsed = np.array([value[:-1] or "NaT" for value in values], dtype="datetime64[us]")
+        except ValueError:
+            pass
+        else:
+            micros = parsed.astype(np.int64)
+            micros[np.isnat(parsed)] = MISSING_TIMESTAMP
+            return array("q", micros.tobytes())
+    return array("q", [_parse_timestamp(value) for value in values])
+
+
+def _parse_timestamp(published_at: str | None) -> int:
+    if not published_at:
+        return MISSING_TIMESTAMP
+    try:
+        published = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+    except ValueError:
+        return MISSING_TIMESTAMP
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return _to_micros(published)
+
+
+def _to_micros(value: datetime) -> int:
+    delta = value - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
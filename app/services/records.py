@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class Comment:
+    original: str
+    like_count: int = 0
+    translated: str | None = None
+    comment_id: str = ""
+    published_at: str = ""
+    verdict: bool | None = None
+    duplicates: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {
+            "original": self.original,
+            "translated": self.translated or self.original,
+            "likeCount": self.like_count,
+        }
+        if self.duplicates:
+            data["duplicates"] = self.duplicates
+        return data
+
+
+@dataclass(slots=True)
+class Video:
+    meta: dict[str, Any]
+    comments: list[Comment] = field(default_factory=list)
+
+    @property
+    def video_id(self) -> str:
+        return self.meta.get("videoId", "")
+
+    def to_dict(self) -> dict[str, Any]:
+        data = dict(self.meta)
+        data["comments"] = [comment.to_dict() for comment in self.comments]
+        return data
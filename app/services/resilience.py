@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+
+from app.services.deadline import DeadlineExceeded, deadline_expired, http_timeout, sleep_within_budget
+
+
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+LATENCY_SAMPLES = 200
+MIN_HEDGE_SAMPLES = 20
+MAX_RETRY_AFTER = 10.0
+# Hedges are paid for with tokens earned by hedge-eligible requests (hedge_budget each), so at
+# most that share of traffic is duplicated; a small burst allowance covers a quiet start.
+HEDGE_BURST = 5.0
+
+logger = logging.getLogger("app.upstream")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    hedge_after: float = 2.0
+    hedge_quantile: float = 0.9
+    hedge_budget: float = 0.05
+    # Past this many outstanding calls, slowness is our own queueing (pool, event loop) and a
+    # duplicate would only add load and quota.
+    hedge_max_in_flight: int = 8
+    retry_status: frozenset[int] = RETRYABLE_STATUS
+
+
+POLICIES = {
+    "youtube": RetryPolicy(attempts=3, base_delay=0.4, hedge_after=1.5),
+    "mymemory": RetryPolicy(attempts=3, base_delay=0.5, hedge_after=2.0),
+    "deepseek": RetryPolicy(attempts=3, base_delay=1.5, max_delay=6.0, hedge_after=10.0),
+}
+DEFAULT_POLICY = RetryPolicy()
+
+
+@dataclass
+class UpstreamMetrics:
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    hedges_skipped: int = 0
+    failures: int = 0
+    in_flight: int = 0
+    hedge_tokens: float = HEDGE_BURST
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+
+    def quantile(self, q: float) -> float | None:
+        if len(self.latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def as_dict(self) -> dict:
+        p50 = self.quantile(0.5)
+        p90 = self.quantile(0.9)
+        return {
+            "requests": self.requests,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedgeWins": self.hedge_wins,
+            "hedgesSkipped": self.hedges_skipped,
+            "failures": self.failures,
+            "p50Ms": None if p50 is None else round(p50 * 1000, 1),
+            "p90Ms": None if p90 is None else round(p90 * 1000, 1),
+        }
+
+
+_metrics: dict[str, UpstreamMetrics] = {}
+
+
+def upstream_metrics() -> dict[str, dict]:
+    return {name: metrics.as_dict() for name, metrics in _metrics.items()}
+
+
+def _metrics_for(upstream: str) -> UpstreamMetrics:
+    metrics = _metrics.get(upstream)
+    if metrics is None:
+        metrics = _metrics[upstream] = UpstreamMetrics()
+    return metrics
+
+
+def is_retryable(outcome: httpx.Response | BaseException, policy: RetryPolicy) -> bool:
+    if isinstance(outcome, httpx.Response):
+        return outcome.status_code in policy.retry_status
+    return isinstance(outcome, httpx.TransportError)
+
+
+def backoff_delay(attempt: int, policy: RetryPolicy, response: httpx.Response | None = None) -> float:
+    if response is not None:
+        retry_after = response.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER)
+    # Full jitter: spreads retries from concurrent languages instead of synchronising them.
+    return random.uniform(0, min(policy.max_delay, policy.base_delay * 2**attempt))
+
+
+async def resilient_request(
+    client,
+    upstream: str,
+    method: str,
+    url: str,
+    *,
+    hedge: bool = False,
+    before_attempt: Callable[[], Awaitable[object]] | None = None,
+    policy: RetryPolicy | None = None,
+    **kwargs,
+) -> httpx.Response:
+    # Returns the last response (callers keep their own status handling) or raises the last
+    # transport error. Only hedge idempotent, cheap requests: the duplicate costs quota too.
+    policy = policy or POLICIES.get(upstream, DEFAULT_POLICY)
+    metrics = _metrics_for(upstream)
+    metrics.requests += 1
+    if hedge:
+        metrics.hedge_tokens = min(HEDGE_BURST, metrics.hedge_tokens + policy.hedge_budget)
+    outcome: httpx.Response | BaseException | None = None
+    for attempt in range(policy.attempts):
+        if deadline_expired():
+            break
+        if attempt:
+            metrics.retries += 1
+        try:
+            outcome = await _send(client, method, url, kwargs, hedge, before_attempt, policy, metrics)
+        except httpx.TransportError as exc:
+            outcome = exc
+        if not is_retryable(outcome, policy) or attempt + 1 >= policy.attempts:
+            break
+        response = outcome if isinstance(outcome, httpx.Response) else None
+        logger.info(
+            "upstream retry",
+            extra={
+                "upstream": upstream,
+                "attempt": attempt + 1,
+                "outcome": response.status_code if response is not None else type(outcome).__name__,
+            },
+        )
+        if not await sleep_within_budget(backoff_delay(attempt, policy, response)):
+            break
+
+    if outcome is None:
+        raise DeadlineExceeded("Request deadline exceeded")
+    if isinstance(outcome, BaseException):
+        metrics.failures += 1
+        raise outcome
+    if outcome.status_code >= 400:
+        metrics.failures += 1
+    return outcome
+
+
+async def _send(client, method, url, kwargs, hedge, before_attempt, policy, metrics) -> httpx.Response:
+    async def attempt() -> httpx.Response:
+        if before_attempt is not None:
+            await before_attempt()
+        metrics.attempts += 1
+        metrics.in_flight += 1
+        started = time.monotonic()
+        try:
+            response = await client.request(method, url, timeout=http_timeout(), **kwargs)
+        finally:
+            metrics.in_flight -= 1
+        metrics.latencies.append(time.monotonic() - started)
+        return response
+
+    if not hedge:
+        return await attempt()
+
+    delay = metrics.quantile(policy.hedge_quantile) or policy.hedge_after
+    primary = asyncio.ensure_future(attempt())
+    secondary = None
+    pending = {primary}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if not done and not deadline_expired():
+            if metrics.hedge_tokens >= 1 and metrics.in_flight <= policy.hedge_max_in_flight:
+                metrics.hedge_tokens -= 1
+                metrics.hedges += 1
+                secondary = asyncio.ensure_future(attempt())
+                pending.add(secondary)
+            else:
+                metrics.hedges_skipped += 1
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is secondary:
+                        metrics.hedge_wins += 1
+                    return task.result()
+        return await primary
+    finally:
+        for task in pending:
+            task.cancel()
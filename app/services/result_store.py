@@ -0,0 +1,87 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+from app.core.responses import dumps, loads
+
+
+HANDLE_BYTES = 12
+
+
+@dataclass(slots=True)
+class StoredResult:
+    body: bytes
+    expires_at: float
+
+
+class ResultStore:
+    # Process-local, byte-bounded LRU of recent /api/video results. Entries hold the compact
+    # JSON rather than the live dicts, so max_bytes bounds what is actually kept in memory;
+    # each get() decodes a private copy.
+    def __init__(self, max_bytes: int, ttl: float):
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._entries: OrderedDict[str, StoredResult] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def put(self, value: dict[str, Any]) -> str:
+        body = dumps(value)
+        # Content-addressed, so the same result keeps the same handle (and ETag) across requests.
+        handle = hashlib.blake2b(body, digest_size=HANDLE_BYTES).hexdigest()
+        self._discard(handle)
+        if len(body) > self._max_bytes:
+            return handle
+        self._entries[handle] = StoredResult(body, time.monotonic() + self._ttl)
+        self._bytes += len(body)
+        self._evict()
+        return handle
+
+    def get(self, handle: str) -> dict[str, Any] | None:
+        entry = self._entries.get(handle)
+        if entry is None or entry.expires_at <= time.monotonic():
+            self._discard(handle)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(handle)
+        self.hits += 1
+        return loads(entry.body)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "maxBytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _discard(self, handle: str) -> None:
+        entry = self._entries.pop(handle, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for handle in [handle for handle, entry in self._entries.items() if entry.expires_at <= now]:
+            self._discard(handle)
+        while self._bytes > self._max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= len(entry.body)
+            self.evictions += 1
+
+
+_result_store: ResultStore | None = None
+
+
+def get_result_store() -> ResultStore:
+    global _result_store
+    if _result_store is None:
+        _result_store = ResultStore(settings.result_store_max_bytes, settings.result_handle_ttl)
+    return _result_store
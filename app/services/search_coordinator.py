@@ -0,0 +1,140 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import replace
+from typing import Awaitable, Callable
+
+from app.services.records import Comment
+
+
+STATS_BATCH_SIZE = 50
+STATS_BATCH_WINDOW = 0.15
+
+StatsFetcher = Callable[[object, list[str]], Awaitable[dict]]
+CommentsFetcher = Callable[[], Awaitable[list[Comment]]]
+
+
+class SearchCoordinator:
+    def __init__(self, expected_searches: int):
+        self._expected = expected_searches
+        self._submissions = 0
+        self._stats: dict[str, asyncio.Future] = {}
+        self._queued: list[str] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._background: set[asyncio.Task] = set()
+        self._comments: dict[str, tuple[asyncio.Future, str]] = {}
+        self._comment_refs: dict[str, int] = {}
+        self._registered = 0
+        self.stats_requested = 0
+        self.stats_calls = 0
+        self.shared_comment_fetches = 0
+        self.released_comment_lists = 0
+
+    async def video_stats(self, client, video_ids: list[str], fetch: StatsFetcher) -> dict:
+        loop = asyncio.get_running_loop()
+        self.stats_requested += len(video_ids)
+        for video_id in video_ids:
+            if video_id not in self._stats:
+                self._stats[video_id] = loop.create_future()
+                self._queued.append(video_id)
+        self._submissions += 1
+        if self._queued:
+            if self._submissions >= self._expected or len(self._queued) >= STATS_BATCH_SIZE:
+                self._flush(client, fetch)
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(STATS_BATCH_WINDOW, self._flush, client, fetch)
+
+        results = {}
+        for video_id in video_ids:
+            item = await asyncio.shield(self._stats[video_id])
+            if item:
+                results[video_id] = item
+        return results
+
+    def _flush(self, client, fetch: StatsFetcher) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        queued, self._queued = self._queued, []
+        for start in range(0, len(queued), STATS_BATCH_SIZE):
+            task = asyncio.ensure_future(self._fetch_stats(client, queued[start : start + STATS_BATCH_SIZE], fetch))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _fetch_stats(self, client, video_ids: list[str], fetch: StatsFetcher) -> None:
+        self.stats_calls += 1
+        try:
+            stats = await fetch(client, video_ids)
+        except Exception as exc:
+            for video_id in video_ids:
+                future = self._stats[video_id]
+                if not future.done():
+                    future.set_exception(exc)
+                    future.exception()
+            return
+        for video_id in video_ids:
+            future = self._stats[video_id]
+            if not future.done():
+                future.set_result(stats.get(video_id))
+
+    def expect_comments(self, video_ids: list[str]) -> None:
+        # Each language declares its candidates once, so a shared raw comment list can be
+        # dropped as soon as its last consumer has it instead of living until the request ends.
+        for video_id in video_ids:
+            self._comment_refs[video_id] = self._comment_refs.get(video_id, 0) + 1
+        self._registered += 1
+        if self._registered >= self._expected:
+            for video_id, (future, _) in list(self._comments.items()):
+                if future.done() and self._comment_refs.get(video_id, 0) <= 0:
+                    self._release(video_id)
+
+    async def comments(self, video_id: str, lang_key: str, fetch: CommentsFetcher) -> list[Comment]:
+        entry = self._comments.get(video_id)
+        if entry is None:
+            entry = (asyncio.ensure_future(fetch()), lang_key)
+            self._comments[video_id] = entry
+        else:
+            self.shared_comment_fetches += 1
+        future, owner = entry
+        comments = await asyncio.shield(future)
+        refs = self._comment_refs.get(video_id)
+        if refs is not None:
+            self._comment_refs[video_id] = refs - 1
+            if refs <= 1 and self._registered >= self._expected:
+                self._release(video_id)
+        # The shared list stays as fetched: every consumer (the owner included) filters, counts
+        # duplicates and translates its own copies. Stored verdicts only hold for the owner's
+        # language; translations (all to zh-CN) are shared.
+        if owner == lang_key:
+            return [replace(comment, duplicates=0) for comment in comments]
+        return [replace(comment, verdict=None, duplicates=0) for comment in comments]
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "statsRequested": self.stats_requested,
+            "statsUnique": len(self._stats),
+            "statsCalls": self.stats_calls,
+            "sharedCommentFetches": self.shared_comment_fetches,
+            "releasedCommentLists": self.released_comment_lists,
+        }
+
+    def _release(self, video_id: str) -> None:
+        if self._comments.pop(video_id, None) is not None:
+            self.released_comment_lists += 1
+
+
+_current_coordinator: ContextVar[SearchCoordinator | None] = ContextVar("search_coordinator", default=None)
+
+
+@contextmanager
+def coordinator_scope(expected_searches: int):
+    coordinator = SearchCoordinator(expected_searches)
+    token = _current_coordinator.set(coordinator)
+    try:
+        yield coordinator
+    finally:
+        _current_coordinator.reset(token)
+
+
+def current_coordinator() -> SearchCoordinator | None:
+    return _current_coordinator.get()
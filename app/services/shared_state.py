@@ -0,0 +1,301 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+
+
+MEMORY_CACHE_SIZE = 2048
+SINGLE_FLIGHT_POLL = 0.2
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+INCR_SCRIPT = """
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if tonumber(ARGV[2]) > 0 and redis.call('PTTL', KEYS[1]) < 0 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return value
+"""
+
+TOKEN_BUCKET_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return allowed
+"""
+
+
+class StateBackend:
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        raise NotImplementedError
+
+    async def acquire_lock(self, key: str, ttl: float) -> str | None:
+        raise NotImplementedError
+
+    async def release_lock(self, key: str, token: str) -> None:
+        raise NotImplementedError
+
+    async def take_token(self, key: str, rate: float, capacity: int) -> bool:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+    def stats(self) -> dict[str, int]:
+        return {}
+
+
+class MemoryBackend(StateBackend):
+    # LRU bounded by entry count and by the bytes of the cached values (video results are a few
+    # hundred KiB each, so the entry cap alone would allow hundreds of MiB).
+    def __init__(self, max_entries: int = MEMORY_CACHE_SIZE, max_bytes: int | None = None):
+        self._max_entries = max_entries
+        self._max_bytes = settings.memory_cache_max_bytes if max_bytes is None else max_bytes
+        self._values: OrderedDict[str, tuple[Any, float | None]] = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    def _read(self, key: str) -> Any:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._pop(key)
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    def _write(self, key: str, value: Any, ttl: float | None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._pop(key)
+        self._values[key] = (value, expires_at)
+        self._bytes += _value_size(value)
+        while len(self._values) > self._max_entries or (self._max_bytes > 0 and self._bytes > self._max_bytes):
+            self._pop(next(iter(self._values)))
+            self.evictions += 1
+
+    def _pop(self, key: str) -> None:
+        entry = self._values.pop(key, None)
+        if entry is not None:
+            self._bytes -= _value_size(entry[0])
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._values),
+            "bytes": self._bytes,
+            "maxBytes": self._max_bytes,
+            "evictions": self.evictions,
+        }
+
+    async def get(self, key: str) -> bytes | None:
+        return self._read(key)
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        self._write(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._pop(key)
+
+    async def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        current = self._read(key)
+        if current is None:
+            self._write(key, amount, ttl)
+            return amount
+        value, expires_at = self._values[key]
+        self._bytes -= _value_size(value)
+        self._values[key] = (int(value) + amount, expires_at)
+        return int(value) + amount
+
+    async def acquire_lock(self, key: str, ttl: float) -> str | None:
+        if self._read(key) is not None:
+            return None
+        token = uuid.uuid4().hex
+        self._write(key, token, ttl)
+        return token
+
+    async def release_lock(self, key: str, token: str) -> None:
+        if self._read(key) == token:
+            self._pop(key)
+
+    async def take_token(self, key: str, rate: float, capacity: int) -> bool:
+        now = time.monotonic()
+        tokens, updated = self._read(key) or (float(capacity), now)
+        tokens = min(float(capacity), tokens + max(0.0, now - updated) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._write(key, (tokens, now), capacity / rate + 1)
+        return allowed
+
+
+class RedisBackend(StateBackend):
+    def __init__(self, url: str | None = None, client: Any = None):
+        if client is None:
+            try:
+                from redis import asyncio as redis_asyncio
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError("STATE_BACKEND_URL requires the 'redis' package") from exc
+            client = redis_asyncio.from_url(url)
+        self._client = client
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        await self._client.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        return int(await self._client.eval(INCR_SCRIPT, 1, key, amount, int((ttl or 0) * 1000)))
+
+    async def acquire_lock(self, key: str, ttl: float) -> str | None:
+        token = uuid.uuid4().hex
+        acquired = await self._client.set(key, token, nx=True, px=int(ttl * 1000))
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str) -> None:
+        await self._client.eval(RELEASE_LOCK_SCRIPT, 1, key, token)
+
+    async def take_token(self, key: str, rate: float, capacity: int) -> bool:
+        allowed = await self._client.eval(TOKEN_BUCKET_SCRIPT, 1, key, rate, capacity, time.time())
+        return bool(int(allowed))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def _value_size(value: Any) -> int:
+    # Cached values are bytes; counters, lock tokens and token buckets are small and not counted.
+    return len(value) if isinstance(value, (bytes, str)) else 0
+
+
+_backend: StateBackend | None = None
+_local_flights: dict[str, asyncio.Future] = {}
+
+
+def get_backend() -> StateBackend:
+    global _backend
+    if _backend is None:
+        _backend = create_backend(settings.state_backend_url)
+    return _backend
+
+
+async def close_backend() -> None:
+    global _backend
+    if _backend is not None:
+        backend, _backend = _backend, None
+        await backend.close()
+
+
+def create_backend(url: str) -> StateBackend:
+    if not url or url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported STATE_BACKEND_URL: {url}")
+
+
+async def cache_get_json(key: str) -> Any:
+    raw = await get_backend().get(key)
+    if raw is None:
+        return None
+    return json.loads(raw)
+
+
+async def cache_set_json(key: str, value: Any, ttl: float | None = None) -> None:
+    await get_backend().set(key, json.dumps(value, ensure_ascii=False).encode("utf-8"), ttl)
+
+
+async def single_flight(
+    key: str,
+    factory: Callable[[], Awaitable[Any]],
+    ttl: float,
+    lock_ttl: float,
+    cacheable: Callable[[Any], bool] = lambda value: True,
+) -> Any:
+    cached = await cache_get_json(key)
+    if cached is not None:
+        return cached
+
+    local = _local_flights.get(key)
+    if local is not None:
+        return await asyncio.shield(local)
+
+    future = asyncio.get_running_loop().create_future()
+    _local_flights[key] = future
+    try:
+        value = await _single_flight_shared(key, factory, ttl, lock_ttl, cacheable)
+    except BaseException as exc:
+        future.set_exception(exc)
+        future.exception()
+        raise
+    else:
+        future.set_result(value)
+        return value
+    finally:
+        _local_flights.pop(key, None)
+
+
+async def _single_flight_shared(key, factory, ttl, lock_ttl, cacheable) -> Any:
+    backend = get_backend()
+    lock_key = f"lock:{key}"
+    deadline = time.monotonic() + lock_ttl
+    while True:
+        token = await backend.acquire_lock(lock_key, lock_ttl)
+        if token is not None:
+            try:
+                value = await factory()
+                if cacheable(value):
+                    await cache_set_json(key, value, ttl)
+                return value
+            finally:
+                await backend.release_lock(lock_key, token)
+        await asyncio.sleep(SINGLE_FLIGHT_POLL)
+        cached = await cache_get_json(key)
+        if cached is not None:
+            return cached
+        if time.monotonic() >= deadline:
+            return await factory()
+
+
+async def count_usage(name: str, amount: int = 1) -> int:
+    day = time.strftime("%Y%m%d", time.gmtime())
+    return await get_backend().incr(f"quota:{name}:{day}", amount, ttl=2 * 86_400)
+
+
+async def allow_request(bucket: str, per_minute: int) -> bool:
+    if per_minute <= 0:
+        return True
+    return await get_backend().take_token(f"ratelimit:{bucket}", per_minute / 60.0, per_minute)
@@ -0,0 +1,142 @@
+import asyncio
+import contextvars
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+from app.services.http_client import get_client
+from app.services.shared_state import count_usage
+from app.services.summarize import summarize_comments_overview
+from app.services.summary_payload import build_summary_payload
+
+
+MAX_SPECULATIONS = 256
+USAGE_KEY = "speculative_summary_tokens"
+
+logger = logging.getLogger("app.speculation")
+
+
+@dataclass(slots=True)
+class Speculation:
+    task: asyncio.Task
+    languages: frozenset[str]
+    token_estimate: int
+    expires_at: float
+
+
+class SpeculativeSummaries:
+    # Global summaries started while /api/video is still running. Entries are reachable by the
+    # video cache key (before the result exists) and by the result handle (after it is stored).
+    def __init__(self, max_entries: int = MAX_SPECULATIONS):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, Speculation] = OrderedDict()
+        self.started = 0
+        self.replaced = 0
+        self.skipped_budget = 0
+        self.attached = 0
+        self.stale = 0
+
+    async def start(self, key: str, query: str, items: list[dict[str, Any]]) -> bool:
+        languages = frozenset(item["key"] for item in items)
+        previous = self._lookup(key)
+        if previous is not None:
+            if previous.languages == languages:
+                return False
+            # More languages finished after the early start; that summary can no longer attach.
+            await self._cancel(previous)
+            self.replaced += 1
+        payload, token_estimate = build_summary_payload(items, settings.summary_token_budget)
+        if not payload:
+            return False
+        used = await count_usage(USAGE_KEY, token_estimate)
+        if used > settings.speculative_summary_budget:
+            await count_usage(USAGE_KEY, -token_estimate)
+            self.skipped_budget += 1
+            return False
+        # A clean context, so the detached task neither inherits the request deadline nor
+        # counts its upstream calls against the request that started it.
+        task = contextvars.Context().run(
+            asyncio.create_task, self._summarize(query, payload, token_estimate, sorted(languages))
+        )
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._remember(key, Speculation(task, languages, token_estimate, 0.0))
+        self.started += 1
+        return True
+
+    def link(self, key: str, handle: str) -> None:
+        entry = self._lookup(key)
+        if entry is not None:
+            self._remember(handle, entry)
+
+    async def attach(self, handle: str, languages: set[str]) -> dict[str, Any] | None:
+        # Only a speculation that covered exactly the languages with videos in the final result
+        # stands in for the real summary.
+        entry = self._lookup(handle)
+        if entry is None:
+            return None
+        if entry.languages != languages:
+            self.stale += 1
+            return None
+        try:
+            result = await asyncio.shield(entry.task)
+        except Exception:
+            return None
+        self.attached += 1
+        return result
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "started": self.started,
+            "replaced": self.replaced,
+            "skippedBudget": self.skipped_budget,
+            "attached": self.attached,
+            "stale": self.stale,
+        }
+
+    async def _summarize(self, query: str, payload: str, token_estimate: int, languages: list[str]) -> dict:
+        # Runs detached from the request that started it (see start()), so it opens its own
+        # client and is bounded by the HTTP timeout rather than the request deadline.
+        try:
+            async with get_client() as client:
+                summary = await summarize_comments_overview(client, query, payload)
+        except Exception:
+            logger.exception("speculative summary failed", extra={"query": query})
+            raise
+        return {"summary": summary, "tokenEstimate": token_estimate, "languages": languages, "speculative": True}
+
+    async def _cancel(self, entry: Speculation) -> None:
+        if entry.task.done():
+            return
+        entry.task.cancel()
+        # Cancelled before it finished, so give its tokens back to the daily budget.
+        await count_usage(USAGE_KEY, -entry.token_estimate)
+
+    def _lookup(self, key: str) -> Speculation | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    def _remember(self, key: str, entry: Speculation) -> None:
+        entry.expires_at = time.monotonic() + settings.result_handle_ttl
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+_speculations: SpeculativeSummaries | None = None
+
+
+def get_speculations() -> SpeculativeSummaries:
+    global _speculations
+    if _speculations is None:
+        _speculations = SpeculativeSummaries()
+    return _speculations
@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.services.records import Comment
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    meta TEXT NOT NULL DEFAULT '{}',
+    comments_fetched_at REAL,
+    PRIMARY KEY (video_id, lang)
+);
+CREATE TABLE IF NOT EXISTS comments (
+    video_id TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    comment_key TEXT NOT NULL,
+    original TEXT NOT NULL,
+    like_count INTEGER NOT NULL DEFAULT 0,
+    published_at TEXT NOT NULL DEFAULT '',
+    verdict INTEGER,
+    translated TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (video_id, lang, comment_key)
+);
+CREATE INDEX IF NOT EXISTS comments_by_video_lang ON comments (video_id, lang, like_count DESC);
+CREATE INDEX IF NOT EXISTS comments_by_published ON comments (video_id, lang, published_at);
+CREATE TABLE IF NOT EXISTS topic_snapshots (
+    topic_id TEXT NOT NULL,
+    query TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (topic_id, taken_at)
+);
+"""
+
+
+def comment_key(comment: Comment) -> str:
+    if comment.comment_id:
+        return comment.comment_id
+    return hashlib.sha1(comment.original.encode("utf-8")).hexdigest()[:20]
+
+
+class CommentStore:
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    async def load_comments(self, video_id: str, lang: str) -> tuple[list[Comment], float | None]:
+        return await asyncio.to_thread(self._load_comments, video_id, lang)
+
+    async def save_comments(self, video_id: str, lang: str, comments: list[Comment]) -> None:
+        await asyncio.to_thread(self._save_comments, video_id, lang, comments)
+
+    async def save_translations(self, video_id: str, lang: str, comments: list[Comment]) -> None:
+        await asyncio.to_thread(self._save_translations, video_id, lang, comments)
+
+    async def save_video(self, video_id: str, lang: str, meta: dict[str, Any]) -> None:
+        await asyncio.to_thread(self._save_video, video_id, lang, meta)
+
+    async def load_snapshot(self, topic_id: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._load_snapshot, topic_id)
+
+    async def save_snapshot(self, topic_id: str, query: str, result: dict[str, Any]) -> float:
+        return await asyncio.to_thread(self._save_snapshot, topic_id, query, result)
+
+    def _load_comments(self, video_id: str, lang: str) -> tuple[list[Comment], float | None]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT comments_fetched_at FROM videos WHERE video_id = ? AND lang = ?",
+                (video_id, lang),
+            ).fetchone()
+            rows = self._conn.execute(
+                "SELECT comment_key, original, like_count, published_at, verdict, translated "
+                "FROM comments WHERE video_id = ? AND lang = ? ORDER BY like_count DESC",
+                (video_id, lang),
+            ).fetchall()
+        comments = [
+            Comment(
+                original=original,
+                like_count=like_count,
+                translated=translated,
+                comment_id=key,
+                published_at=published_at,
+                verdict=None if verdict is None else bool(verdict),
+            )
+            for key, original, like_count, published_at, verdict, translated in rows
+        ]
+        return comments, row[0] if row else None
+
+    def _save_comments(self, video_id: str, lang: str, comments: list[Comment]) -> None:
+        now = time.time()
+        rows = [
+            (
+                video_id,
+                lang,
+                comment_key(comment),
+                comment.original,
+                comment.like_count,
+                comment.published_at,
+                None if comment.verdict is None else int(comment.verdict),
+                comment.translated,
+                now,
+            )
+            for comment in comments
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO comments "
+                "(video_id, lang, comment_key, original, like_count, published_at, verdict, translated, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (video_id, lang, comment_key) DO UPDATE SET "
+                "like_count = excluded.like_count, "
+                "verdict = COALESCE(excluded.verdict, comments.verdict), "
+                "translated = COALESCE(excluded.translated, comments.translated), "
+                "updated_at = excluded.updated_at",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT INTO videos (video_id, lang, comments_fetched_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (video_id, lang) DO UPDATE SET comments_fetched_at = excluded.comments_fetched_at",
+                (video_id, lang, now),
+            )
+
+    def _save_translations(self, video_id: str, lang: str, comments: list[Comment]) -> None:
+        now = time.time()
+        rows = [
+            (comment.translated, now, video_id, lang, comment_key(comment))
+            for comment in comments
+            if comment.translated and comment.translated != comment.original
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE comments SET translated = ?, updated_at = ? "
+                "WHERE video_id = ? AND lang = ? AND comment_key = ?",
+                rows,
+            )
+
+    def _save_video(self, video_id: str, lang: str, meta: dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO videos (video_id, lang, meta) VALUES (?, ?, ?) "
+                "ON CONFLICT (video_id, lang) DO UPDATE SET meta = excluded.meta",
+                (video_id, lang, json.dumps(meta, ensure_ascii=False)),
+            )
+
+    def _load_snapshot(self, topic_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT query, taken_at, result FROM topic_snapshots "
+                "WHERE topic_id = ? ORDER BY taken_at DESC LIMIT 1",
+                (topic_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        query, taken_at, result = row
+        return {"topicId": topic_id, "query": query, "takenAt": taken_at, "snapshot": json.loads(result)}
+
+    def _save_snapshot(self, topic_id: str, query: str, result: dict[str, Any]) -> float:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO topic_snapshots (topic_id, query, taken_at, result) VALUES (?, ?, ?, ?)",
+                (topic_id, query, now, json.dumps(result, ensure_ascii=False)),
+            )
+        return now
+
+
+_store: CommentStore | None = None
+
+
+def get_store() -> CommentStore | None:
+    global _store
+    if not settings.comment_store_path:
+        return None
+    if _store is None:
+        _store = CommentStore(settings.comment_store_path)
+    return _store
+
+
+def close_store() -> None:
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+
+
+def is_fresh(fetched_at: float | None) -> bool:
+    return fetched_at is not None and time.time() - fetched_at < settings.comment_store_ttl
+
+
+def latest_published(comments: list[Comment]) -> str:
+    return max((comment.published_at for comment in comments), default="")
+
+
+def merge_comments(existing: list[Comment], incoming: list[Comment]) -> list[Comment]:
+    merged = {comment_key(comment): comment for comment in existing}
+    for comment in incoming:
+        key = comment_key(comment)
+        known = merged.get(key)
+        if known is not None:
+            known.like_count = comment.like_count
+            continue
+        merged[key] = comment
+    return sorted(merged.values(), key=lambda x: x.like_count, reverse=True)
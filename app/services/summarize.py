@@ -1,4 +1,10 @@
-from app.services.deepseek import chat
+import asyncio
+import hashlib
+
+from app.core.config import settings
+from app.services.deepseek import DeepSeekError, chat
+from app.services.shared_state import cache_get_json, cache_set_json
+from app.services.summary_payload import estimate_tokens
 from app.services.utils import clip_text
 
 
@@ -53,7 +59,7 @@ async def summarize_comments_local(client, query: str, comments_payload: str) ->
     user = (
         "请基于单一语言评论生成简洁总结，按以下顺序输出：\n"
         "1) 观点摘要（3-5条）\n"
-        "2) 情绪倾向（正面/中性/负面，并给一句解释）\n"
+        "2) 单独一行写“情绪倾向：<标签>”，标签只能是 正面、中性 或 负面 之一，下一行给一句解释\n"
         "3) 关注焦点（关键词3-5个）\n"
         "要求：用中文输出，语气中立，结构清晰。\n"
         f"事件关键词：{query}\n"
@@ -70,6 +76,87 @@ async def summarize_comments_local(client, query: str, comments_payload: str) ->
     )
 
 
+async def summarize_comments_reduce(client, query: str, summaries_payload: str) -> str:
+    system = "你是跨语言舆情分析专家，擅长提炼不同国家/语言群体的态度差异。"
+    user = (
+        "下面是各语言评论区的分语种总结，请在此基础上生成跨语言结构化报告，按以下顺序输出：\n"
+        "1) 各语言观点摘要（每种语言1-2条）\n"
+        "2) 总体情绪倾向\n"
+        "3) 主要共识（2-3条）\n"
+        "4) 主要分歧（2-3条）\n"
+        "5) 可能原因（1-2条）\n"
+        "要求：用中文输出，语气中立，条目清晰，不要编造分语种总结中没有的信息。\n"
+        f"事件关键词：{query}\n"
+        f"分语种总结：{summaries_payload}"
+    )
+    return await chat(
+        client,
+        [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+        temperature=0.3,
+        max_tokens=900,
+    )
+
+
+async def summarize_languages(
+    client,
+    query: str,
+    language_payloads: list[tuple[str, str]],
+) -> list[str | BaseException]:
+    semaphore = asyncio.Semaphore(settings.max_concurrency)
+
+    async def map_step(label: str, payload: str) -> str:
+        key = _cache_key("map", query, label, payload)
+        cached = await cache_get_json(key)
+        if cached is not None:
+            return cached
+        async with semaphore:
+            summary = await summarize_comments_local(client, query, f"{label}: {payload}")
+        await cache_set_json(key, summary, settings.summary_cache_ttl)
+        return summary
+
+    return await asyncio.gather(
+        *[map_step(label, payload) for label, payload in language_payloads],
+        return_exceptions=True,
+    )
+
+
+async def summarize_comments_hierarchical(
+    client,
+    query: str,
+    language_payloads: list[tuple[str, str]],
+) -> tuple[str, int]:
+    # Returns the summary and the token estimate of the reduce prompt built from the map outputs.
+    results = await summarize_languages(client, query, language_payloads)
+    partials = []
+    for (label, _), result in zip(language_payloads, results):
+        if isinstance(result, str) and result:
+            partials.append(f"【{label}】\n{result}")
+    if not partials:
+        errors = [result for result in results if isinstance(result, BaseException)]
+        raise errors[0] if errors else DeepSeekError("No language summaries produced")
+
+    reduce_payload = "\n\n".join(partials)
+    reduce_tokens = estimate_tokens(reduce_payload)
+    key = _cache_key("reduce", query, reduce_payload)
+    cached = await cache_get_json(key)
+    if cached is not None:
+        return cached, reduce_tokens
+    summary = await summarize_comments_reduce(client, query, reduce_payload)
+    await cache_set_json(key, summary, settings.summary_cache_ttl)
+    return summary, reduce_tokens
+
+
+def _cache_key(*parts: str) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return f"summary:{digest.hexdigest()}"
+
+
 async def summarize_news_overview(client, query: str, summaries_payload: str) -> str:
     system = "你是国际媒体观察员，擅长比较多国媒体报道角度和立场。"
     user = (
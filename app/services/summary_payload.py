@@ -0,0 +1,126 @@
+import math
+from typing import Any
+
+from app.services.dedup import find_duplicate_groups
+from app.services.utils import clip_text
+
+
+MAX_COMMENT_CHARS = 200
+DIVERSITY_WEIGHT = 0.6
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    wide = sum(1 for ch in text if ord(ch) > 0x2E80)
+    return math.ceil(wide * 0.6 + (len(text) - wide) / 4)
+
+
+def build_summary_payload(items: list[dict[str, Any]], token_budget: int) -> tuple[str, int]:
+    lines = [f"{label}: {text}" for label, text in build_language_payloads(items, token_budget)]
+    payload = "\n".join(lines)
+    return payload, estimate_tokens(payload)
+
+
+def build_language_payloads(
+    items: list[dict[str, Any]],
+    token_budget: int,
+    split: bool = True,
+) -> list[tuple[str, str]]:
+    groups = []
+    for item in items:
+        candidates = _candidates(item)
+        if candidates:
+            groups.append((item.get("label", ""), candidates))
+    if not groups:
+        return []
+
+    selections = {}
+    remaining = token_budget
+    by_demand = sorted(range(len(groups)), key=lambda index: sum(c["tokens"] for c in groups[index][1]))
+    for position, index in enumerate(by_demand):
+        label, candidates = groups[index]
+        overhead = estimate_tokens(f"{label}: ")
+        share = remaining // (len(groups) - position) if split else token_budget
+        chosen = _select_diverse(candidates, share - overhead)
+        selections[index] = chosen
+        remaining -= sum(c["tokens"] for c in chosen) + overhead
+
+    payloads = []
+    for index, (label, _) in enumerate(groups):
+        chosen = selections.get(index)
+        if chosen:
+            payloads.append((label, " / ".join(c["text"] for c in chosen)))
+    return payloads
+
+
+def _candidates(item: dict[str, Any]) -> list[dict[str, Any]]:
+    comments = item.get("comments") or [
+        comment for video in item.get("videos") or [] for comment in video.get("comments") or []
+    ]
+    comments = [comment for comment in comments if comment.get("translated") or comment.get("original")]
+    # Near-duplicates only raise a comment's weight; each one is still shown with its own text.
+    groups = find_duplicate_groups([comment.get("original") or comment.get("translated") for comment in comments])
+    similar: dict[int, int] = {}
+    for group in groups:
+        similar[group] = similar.get(group, 0) + 1
+
+    candidates = []
+    for comment, group in zip(comments, groups):
+        text = clip_text(comment.get("translated") or comment.get("original", ""), MAX_COMMENT_CHARS)
+        if not text:
+            continue
+        duplicates = int(comment.get("duplicates", 0) or 0)
+        if duplicates:
+            text += f"（×{duplicates + 1}）"
+        weight = math.log1p(int(comment.get("likeCount", 0) or 0)) + math.log1p(duplicates + similar[group] - 1)
+        candidates.append(
+            {
+                "text": text,
+                "tokens": estimate_tokens(text) + 1,
+                "weight": weight,
+                "vector": _vectorize(text),
+            }
+        )
+    return candidates
+
+
+def _select_diverse(candidates: list[dict[str, Any]], budget: int) -> list[dict[str, Any]]:
+    if budget <= 0:
+        return []
+    top_weight = max(c["weight"] for c in candidates) or 1.0
+    remaining = list(candidates)
+    chosen: list[dict[str, Any]] = []
+    used = 0
+    while remaining:
+        best, best_score = None, -math.inf
+        for candidate in remaining:
+            if used + candidate["tokens"] > budget:
+                continue
+            redundancy = max((_cosine(candidate["vector"], c["vector"]) for c in chosen), default=0.0)
+            score = (1 - DIVERSITY_WEIGHT) * candidate["weight"] / top_weight - DIVERSITY_WEIGHT * redundancy
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is None:
+            break
+        chosen.append(best)
+        remaining.remove(best)
+        used += best["tokens"]
+    return chosen
+
+
+def _vectorize(text: str) -> dict[str, float]:
+    counts: dict[str, float] = {}
+    lowered = text.lower()
+    for i in range(len(lowered) - 1):
+        gram = lowered[i : i + 2]
+        if gram.strip():
+            counts[gram] = counts.get(gram, 0.0) + 1.0
+    norm = math.sqrt(sum(value * value for value in counts.values())) or 1.0
+    return {gram: value / norm for gram, value in counts.items()}
+
+
+def _cosine(left: dict[str, float], right: dict[str, float]) -> float:
+    if len(left) > len(right):
+        left, right = right, left
+    return sum(value * right.get(gram, 0.0) for gram, value in left.items())
@@ -0,0 +1,211 @@
+import atexit
+import contextvars
+import copy
+import cProfile
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core.config import settings
+
+
+PROFILE_RATE_KEY = "profile:sample_rate"
+PROFILE_RATE_REFRESH = 5.0
+REQUEST_ID_MAX_LENGTH = 64
+
+_REQUEST_ID_UNSAFE = re.compile(r"[^A-Za-z0-9-]")
+
+_STANDARD_ATTRS = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime"}
+
+_request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_id", default=None)
+_upstream: contextvars.ContextVar[dict[str, dict[str, float]] | None] = contextvars.ContextVar(
+    "upstream_calls", default=None
+)
+
+_listener: logging.handlers.QueueListener | None = None
+_profile_rate: tuple[float, float] | None = None
+_profiling = False
+_traceback_formatter = logging.Formatter()
+
+logger = logging.getLogger("app")
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Runs on the calling task, so the request context is still visible here.
+        record.request_id = _request_id.get()
+        upstream = _upstream.get()
+        if upstream and not hasattr(record, "upstream"):
+            record.upstream = {name: dict(stats) for name, stats in upstream.items()}
+        return True
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() folds the traceback into the message. Render it on the calling
+        # thread but keep it in exc_text, so JsonFormatter still writes a separate "exception".
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging() -> None:
+    global _listener
+    if _listener is not None:
+        return
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = ContextQueueHandler(records)
+    queue_handler.addFilter(ContextFilter())
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+    _listener = logging.handlers.QueueListener(records, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    logger.handlers = [queue_handler]
+    logger.setLevel(settings.log_level.upper())
+    logger.propagate = False
+
+
+@contextmanager
+def request_context(request_id: str | None = None):
+    # Client-supplied IDs are echoed in headers and used in profile file names.
+    request_id = _REQUEST_ID_UNSAFE.sub("", request_id or "")[:REQUEST_ID_MAX_LENGTH]
+    request_token = _request_id.set(request_id or uuid.uuid4().hex[:16])
+    upstream_token = _upstream.set({})
+    try:
+        yield _request_id.get()
+    finally:
+        _request_id.reset(request_token)
+        _upstream.reset(upstream_token)
+
+
+def current_request_id() -> str | None:
+    return _request_id.get()
+
+
+def upstream_summary() -> dict[str, dict[str, float]]:
+    upstream = _upstream.get() or {}
+    return {
+        name: {"calls": int(stats["calls"]), "errors": int(stats["errors"]), "ms": round(stats["seconds"] * 1000, 1)}
+        for name, stats in upstream.items()
+    }
+
+
+def record_upstream(name: str, seconds: float, ok: bool = True) -> None:
+    upstream = _upstream.get()
+    if upstream is None:
+        return
+    stats = upstream.setdefault(name, {"calls": 0, "errors": 0, "seconds": 0.0})
+    stats["calls"] += 1
+    stats["seconds"] += seconds
+    if not ok:
+        stats["errors"] += 1
+
+
+def upstream_name(url) -> str:
+    # Compare full prefixes so a single mock server can stand in for several upstreams.
+    target = str(url)
+    for name, base_url in (
+        ("youtube", settings.youtube_api_base_url),
+        ("mymemory", settings.mymemory_base_url),
+        ("deepseek", settings.deepseek_base_url),
+    ):
+        if target.startswith(base_url.rstrip("/")):
+            return name
+    if any(target.startswith(instance.rstrip("/")) for instance in settings.invidious_instances):
+        return "invidious"
+    return url.host
+
+
+async def on_request(request) -> None:
+    request.extensions["telemetry_started"] = time.perf_counter()
+
+
+async def on_response(response) -> None:
+    started = response.request.extensions.get("telemetry_started")
+    if started is not None:
+        record_upstream(
+            upstream_name(response.request.url),
+            time.perf_counter() - started,
+            ok=response.status_code < 400,
+        )
+
+
+async def profile_sample_rate() -> float:
+    global _profile_rate
+    now = time.monotonic()
+    if _profile_rate is None or now - _profile_rate[1] > PROFILE_RATE_REFRESH:
+        from app.services.shared_state import get_backend
+
+        rate = settings.profile_sample_rate
+        try:
+            stored = await get_backend().get(PROFILE_RATE_KEY)
+        except Exception:
+            stored = None
+        if stored is not None:
+            rate = float(stored)
+        _profile_rate = (rate, now)
+    return _profile_rate[0]
+
+
+async def set_profile_sample_rate(rate: float) -> None:
+    global _profile_rate
+    from app.services.shared_state import get_backend
+
+    await get_backend().set(PROFILE_RATE_KEY, str(rate).encode("ascii"))
+    _profile_rate = (rate, time.monotonic())
+
+
+@contextmanager
+def maybe_profile(rate: float, label: str):
+    # cProfile sees the whole event loop thread, so concurrent requests show up in the same dump.
+    global _profiling
+    if _profiling or rate <= 0 or random.random() >= rate:
+        yield None
+        return
+    _profiling = True
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        _profiling = False
+        directory = Path(settings.profile_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{label}.prof"
+        profiler.dump_stats(path)
+        logger.info("profile written", extra={"path": str(path)})
@@ -0,0 +1,82 @@
+import hashlib
+import re
+from datetime import datetime, timezone
+from typing import Any
+
+
+SENTIMENT_LABELS = ("正面", "中性", "负面")
+SENTIMENT_HEADING = "情绪倾向"
+# The label is whatever follows the colon, so an echoed heading such as
+# "情绪倾向（正面/中性/负面）：负面" or "**情绪倾向**：负面" still yields 负面.
+SENTIMENT_LINE = re.compile(
+    SENTIMENT_HEADING + r"[^\n：:]{0,30}[：:][\s*]*(" + "|".join(SENTIMENT_LABELS) + ")"
+)
+
+
+def topic_key(query: str) -> str:
+    normalized = " ".join(query.lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def snapshot_cutoff(taken_at: float) -> str:
+    return datetime.fromtimestamp(taken_at, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def known_videos(snapshot: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
+    return {
+        item["key"]: [
+            {key: value for key, value in video.items() if key != "comments"}
+            for video in item.get("videos", [])
+        ]
+        for item in snapshot.get("items", [])
+        if "key" in item
+    }
+
+
+def extract_sentiment(summary: str) -> str | None:
+    match = SENTIMENT_LINE.search(summary)
+    return match.group(1) if match else None
+
+
+def diff_snapshots(before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
+    before_items = {item.get("key"): item for item in before.get("items", [])}
+    before_sentiments = before.get("sentiments", {})
+    after_sentiments = after.get("sentiments", {})
+    languages = []
+    for item in after.get("items", []):
+        key = item.get("key")
+        previous = before_items.get(key, {})
+        old_videos = {video["videoId"]: video for video in previous.get("videos", [])}
+        new_videos = {video["videoId"]: video for video in item.get("videos", [])}
+
+        new_comments = []
+        for video_id, video in new_videos.items():
+            seen = {comment.get("original") for comment in old_videos.get(video_id, {}).get("comments", [])}
+            for comment in video.get("comments", []):
+                if comment.get("original") not in seen:
+                    new_comments.append({"videoId": video_id, **comment})
+
+        entry = {
+            "key": key,
+            "label": item.get("label"),
+            "newVideos": [
+                {"videoId": video_id, "title": video.get("title", ""), "url": video.get("url", "")}
+                for video_id, video in new_videos.items()
+                if video_id not in old_videos
+            ],
+            "removedVideos": [video_id for video_id in old_videos if video_id not in new_videos],
+            "newComments": new_comments,
+            "commentCountChange": item.get("commentCount", 0) - previous.get("commentCount", 0),
+        }
+        old_sentiment = (before_sentiments.get(key) or {}).get("sentiment")
+        new_sentiment = (after_sentiments.get(key) or {}).get("sentiment")
+        if old_sentiment and new_sentiment and old_sentiment != new_sentiment:
+            entry["sentiment"] = {"before": old_sentiment, "after": new_sentiment}
+        languages.append(entry)
+
+    return {
+        "languages": languages,
+        "newVideoCount": sum(len(entry["newVideos"]) for entry in languages),
+        "newCommentCount": sum(len(entry["newComments"]) for entry in languages),
+        "sentimentShifts": sum(1 for entry in languages if "sentiment" in entry),
+    }
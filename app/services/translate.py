@@ -1,12 +1,17 @@
-import json
-import re
+import asyncio
 
 from app.core.config import settings
-from app.services.deepseek import chat, DeepSeekError
+from app.services.deadline import deadline_expired
+from app.services.language_match import MIN_CONFIDENCE, detect_languages
+from app.services.translation_providers import (
+    TranslateError,
+    TranslationProvider,
+    rank_providers,
+    run_provider,
+)
 
 
-class TranslateError(RuntimeError):
-    pass
+MIN_TRANSLATABLE_LETTERS = 2
 
 
 def _looks_cjk(text: str) -> bool:
@@ -24,22 +29,7 @@ async def translate_text(client, text: str, source_lang: str, target_lang: str =
     if source_lang == "auto" and target_lang.lower().startswith("zh") and _looks_cjk(text):
         return text
 
-    provider = settings.translate_provider.lower()
-    if provider == "mymemory":
-        if source_lang == "auto":
-            if settings.deepseek_api_key:
-                return await _translate_deepseek(client, text, source_lang, target_lang)
-            return text
-        try:
-            return await _translate_mymemory(client, text, source_lang, target_lang)
-        except Exception:
-            if settings.deepseek_api_key:
-                return await _translate_deepseek(client, text, source_lang, target_lang)
-            raise
-    if provider == "deepseek":
-        return await _translate_deepseek(client, text, source_lang, target_lang)
-
-    raise TranslateError(f"Unsupported translation provider: {settings.translate_provider}")
+    return (await translate_texts(client, [text], source_lang, target_lang))[0]
 
 
 async def translate_texts(
@@ -50,109 +40,71 @@ async def translate_texts(
 ) -> list[str]:
     if not texts:
         return []
-
-    provider = settings.translate_provider.lower()
-    if provider == "deepseek":
-        try:
-            return await _translate_deepseek_batch(client, texts, source_lang, target_lang)
-        except DeepSeekError:
-            return await _translate_fallback_batch(client, texts, source_lang, target_lang)
-
-    if provider == "mymemory":
-        return await _translate_fallback_batch(client, texts, source_lang, target_lang)
-
-    raise TranslateError(f"Unsupported translation provider: {settings.translate_provider}")
-
-
-async def _translate_fallback_batch(
+    if source_lang.lower().split("-")[0] == target_lang.lower().split("-")[0]:
+        return list(texts)
+
+    skip = _skip_translation(texts, target_lang)
+    if not any(skip):
+        return await _translate_routed(client, texts, source_lang, target_lang)
+    pending = [text for text, skipped in zip(texts, skip) if not skipped]
+    translated = iter(await _translate_routed(client, pending, source_lang, target_lang) if pending else [])
+    return [text if skipped else next(translated) for text, skipped in zip(texts, skip)]
+
+
+def _skip_translation(texts: list[str], target_lang: str) -> list[bool]:
+    target = target_lang.lower().split("-")[0]
+    detections = detect_languages(texts)
+    return [
+        sum(map(str.isalpha, text)) < MIN_TRANSLATABLE_LETTERS
+        or (detection.lang == target and (detection.script != "latin" or detection.confidence >= MIN_CONFIDENCE))
+        for text, detection in zip(texts, detections)
+    ]
+
+
+async def _translate_routed(client, texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+    providers = rank_providers(source_lang, target_lang, texts)
+    index = 0
+    while index < len(providers) and not deadline_expired():
+        primary = providers[index]
+        backup = providers[index + 1] if index + 1 < len(providers) else None
+        results, hedged = await _run_hedged(client, primary, backup, texts, source_lang, target_lang)
+        if results is not None:
+            return results
+        index += 2 if hedged else 1
+    return list(texts)
+
+
+def _hedge_delay(provider: TranslationProvider, batch_size: int) -> float | None:
+    if settings.translate_hedge_after <= 0:
+        return None
+    if provider.stats.latency_ema is None:
+        return settings.translate_hedge_after
+    return max(settings.translate_hedge_after, 2 * provider.expected_latency(batch_size))
+
+
+async def _run_hedged(
     client,
+    primary: TranslationProvider,
+    backup: TranslationProvider | None,
     texts: list[str],
     source_lang: str,
     target_lang: str,
-) -> list[str]:
-    results = []
-    for text in texts:
-        try:
-            results.append(await translate_text(client, text, source_lang, target_lang))
-        except Exception:
-            results.append(text)
-    return results
-
-
-async def _translate_mymemory(client, text: str, source_lang: str, target_lang: str) -> str:
-    params = {
-        "q": text,
-        "langpair": f"{source_lang}|{target_lang}",
-    }
-    if settings.mymemory_email:
-        params["de"] = settings.mymemory_email
-
-    response = await client.get("https://api.mymemory.translated.net/get", params=params)
-    response.raise_for_status()
-    data = response.json()
-    translated = data.get("responseData", {}).get("translatedText")
-    if not translated:
-        return text
-    return translated
-
-
-async def _translate_deepseek(client, text: str, source_lang: str, target_lang: str) -> str:
-    system = "你是专业翻译引擎，只输出翻译结果，不要添加解释。"
-    user = (
-        "请进行快速、地道的翻译，保持原意与语气，不要增加或删减信息。\n"
-        f"源语言：{source_lang}\n"
-        f"目标语言：{target_lang}\n"
-        f"文本：{text}"
-    )
-    try:
-        return await chat(
-            client,
-            [
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-            temperature=0.2,
-            max_tokens=900,
-        )
-    except DeepSeekError:
-        return text
-
-
-async def _translate_deepseek_batch(
-    client,
-    texts: list[str],
-    source_lang: str,
-    target_lang: str,
-) -> list[str]:
-    system = "你是专业翻译引擎，只输出翻译结果，不要添加解释。"
-    payload = json.dumps(texts, ensure_ascii=False)
-    user = (
-        "请进行快速、地道的翻译，保持原意与语气。\n"
-        "要求：仅输出 JSON 数组，顺序与输入一致，不要添加额外文本或代码块。\n"
-        f"源语言：{source_lang}\n"
-        f"目标语言：{target_lang}\n"
-        f"文本列表：{payload}"
-    )
-    response = await chat(
-        client,
-        [
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ],
-        temperature=0.2,
-        max_tokens=2000,
-    )
-    translations = _extract_json_array(response)
-    if len(translations) != len(texts):
-        raise DeepSeekError("Batch translation length mismatch")
-    return [str(item) for item in translations]
-
-
-def _extract_json_array(text: str) -> list:
-    match = re.search(r"\[.*\]", text, re.DOTALL)
-    if not match:
-        raise DeepSeekError("No JSON array found in translation response")
+) -> tuple[list[str] | None, bool]:
+    pending = {asyncio.create_task(run_provider(primary, client, texts, source_lang, target_lang))}
+    hedged = False
     try:
-        return json.loads(match.group(0))
-    except json.JSONDecodeError as exc:
-        raise DeepSeekError("Failed to parse translation JSON") from exc
+        delay = _hedge_delay(primary, len(texts)) if backup is not None else None
+        if delay is not None:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                pending.add(asyncio.create_task(run_provider(backup, client, texts, source_lang, target_lang)))
+                hedged = True
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), hedged
+        return None, hedged
+    finally:
+        for task in pending:
+            task.cancel()
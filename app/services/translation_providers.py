@@ -0,0 +1,287 @@
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.services.deadline import deadline_expired
+from app.services.deepseek import DeepSeekError, chat
+from app.services.resilience import resilient_request
+
+
+STATS_SMOOTHING = 0.2
+# Without traffic a penalized provider would never be tried again, so its error rate fades:
+# a provider at 100% errors drops under the 50% penalty line after one half-life.
+ERROR_RATE_HALF_LIFE = 60.0
+ERROR_RATE_PENALTY = 0.5
+
+
+class TranslateError(RuntimeError):
+    pass
+
+
+@dataclass
+class ProviderStats:
+    calls: int = 0
+    errors: int = 0
+    texts: int = 0
+    cost: float = 0.0
+    latency_ema: float | None = None
+    error_rate_ema: float = 0.0
+    error_rate_at: float = 0.0
+
+    def error_rate(self, now: float | None = None) -> float:
+        if not self.error_rate_ema:
+            return 0.0
+        elapsed = (time.monotonic() if now is None else now) - self.error_rate_at
+        return self.error_rate_ema * 0.5 ** (max(0.0, elapsed) / ERROR_RATE_HALF_LIFE)
+
+    def record(self, latency: float, ok: bool, texts: int, cost: float) -> None:
+        now = time.monotonic()
+        self.calls += 1
+        self.texts += texts
+        self.cost += cost
+        if not ok:
+            self.errors += 1
+        sample = 0.0 if ok else 1.0
+        self.error_rate_ema = (1 - STATS_SMOOTHING) * self.error_rate(now) + STATS_SMOOTHING * sample
+        self.error_rate_at = now
+        if ok:
+            if self.latency_ema is None:
+                self.latency_ema = latency
+            else:
+                self.latency_ema = (1 - STATS_SMOOTHING) * self.latency_ema + STATS_SMOOTHING * latency
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "texts": self.texts,
+            "cost": round(self.cost, 6),
+            "latencyMs": None if self.latency_ema is None else round(self.latency_ema * 1000, 1),
+            "errorRate": round(self.error_rate(), 3),
+        }
+
+
+class TranslationProvider:
+    name = ""
+    max_batch = 1
+    cost_per_1k_chars = 0.0
+    default_latency = 1.0
+    routable = True
+
+    def __init__(self):
+        self.stats = ProviderStats()
+
+    def available(self) -> bool:
+        return True
+
+    def supports(self, source_lang: str, target_lang: str) -> bool:
+        return True
+
+    def estimate_cost(self, texts: list[str]) -> float:
+        return sum(len(text) for text in texts) / 1000 * self.cost_per_1k_chars
+
+    def expected_latency(self, batch_size: int) -> float:
+        latency = self.stats.latency_ema if self.stats.latency_ema is not None else self.default_latency
+        calls = -(-batch_size // self.max_batch) if self.max_batch else 1
+        return latency * max(1, calls)
+
+    async def translate_batch(self, client, texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+        raise NotImplementedError
+
+
+class DeepSeekProvider(TranslationProvider):
+    name = "deepseek"
+    max_batch = 60
+    cost_per_1k_chars = 0.0004
+    default_latency = 4.0
+
+    def available(self) -> bool:
+        return bool(settings.deepseek_api_key)
+
+    async def translate_batch(self, client, texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+        results = []
+        for start in range(0, len(texts), self.max_batch):
+            results.extend(await self._translate_chunk(client, texts[start : start + self.max_batch], source_lang, target_lang))
+        return results
+
+    async def _translate_chunk(self, client, texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+        if len(texts) == 1:
+            return [await self._translate_one(client, texts[0], source_lang, target_lang)]
+        system = "你是专业翻译引擎，只输出翻译结果，不要添加解释。"
+        payload = json.dumps(texts, ensure_ascii=False)
+        user = (
+            "请进行快速、地道的翻译，保持原意与语气。\n"
+            "要求：仅输出 JSON 数组，顺序与输入一致，不要添加额外文本或代码块。\n"
+            f"源语言：{source_lang}\n"
+            f"目标语言：{target_lang}\n"
+            f"文本列表：{payload}"
+        )
+        response = await chat(
+            client,
+            [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            temperature=0.2,
+            max_tokens=2000,
+        )
+        translations = _extract_json_array(response)
+        if len(translations) != len(texts):
+            raise DeepSeekError("Batch translation length mismatch")
+        return [str(item) for item in translations]
+
+    async def _translate_one(self, client, text: str, source_lang: str, target_lang: str) -> str:
+        system = "你是专业翻译引擎，只输出翻译结果，不要添加解释。"
+        user = (
+            "请进行快速、地道的翻译，保持原意与语气，不要增加或删减信息。\n"
+            f"源语言：{source_lang}\n"
+            f"目标语言：{target_lang}\n"
+            f"文本：{text}"
+        )
+        return await chat(
+            client,
+            [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            temperature=0.2,
+            max_tokens=900,
+        )
+
+
+class MyMemoryProvider(TranslationProvider):
+    name = "mymemory"
+    max_batch = 1
+    default_latency = 1.2
+
+    def supports(self, source_lang: str, target_lang: str) -> bool:
+        return source_lang != "auto"
+
+    async def translate_batch(self, client, texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+        results = []
+        failure: Exception | None = None
+        for text in texts:
+            if deadline_expired():
+                results.append(text)
+                continue
+            try:
+                results.append(await self._translate_one(client, text, source_lang, target_lang))
+            except Exception as exc:
+                failure = exc
+                results.append(text)
+        if failure is not None and all(result is text for result, text in zip(results, texts)):
+            raise failure
+        return results
+
+    async def _translate_one(self, client, text: str, source_lang: str, target_lang: str) -> str:
+        params = {
+            "q": text,
+            "langpair": f"{source_lang}|{target_lang}",
+        }
+        if settings.mymemory_email:
+            params["de"] = settings.mymemory_email
+
+        response = await resilient_request(
+            client,
+            "mymemory",
+            "GET",
+            f"{settings.mymemory_base_url.rstrip('/')}/get",
+            params=params,
+            hedge=True,
+        )
+        response.raise_for_status()
+        data = response.json()
+        translated = data.get("responseData", {}).get("translatedText")
+        if not translated:
+            return text
+        return translated
+
+
+class OfflineProvider(TranslationProvider):
+    name = "offline"
+    max_batch = 1000
+    default_latency = 0.0
+    routable = False
+
+    async def translate_batch(self, client, texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+        return list(texts)
+
+
+_registry: dict[str, TranslationProvider] = {}
+
+
+def register_provider(provider: TranslationProvider) -> TranslationProvider:
+    _registry[provider.name] = provider
+    return provider
+
+
+def get_provider(name: str) -> TranslationProvider | None:
+    return _registry.get(name.lower())
+
+
+def registered_providers() -> list[TranslationProvider]:
+    return list(_registry.values())
+
+
+def provider_stats() -> dict[str, dict]:
+    return {
+        provider.name: {"available": provider.available(), **provider.stats.as_dict()}
+        for provider in _registry.values()
+    }
+
+
+def rank_providers(source_lang: str, target_lang: str, texts: list[str]) -> list[TranslationProvider]:
+    preferred = get_provider(settings.translate_provider)
+    if preferred is None:
+        raise TranslateError(f"Unsupported translation provider: {settings.translate_provider}")
+
+    candidates = [
+        provider
+        for provider in _registry.values()
+        if (provider.routable or provider is preferred)
+        and provider.available()
+        and provider.supports(source_lang, target_lang)
+    ]
+
+    def score(provider: TranslationProvider) -> float:
+        value = provider.expected_latency(len(texts)) + provider.estimate_cost(texts)
+        if provider.stats.error_rate() > ERROR_RATE_PENALTY:
+            value += 1000.0
+        if provider is preferred:
+            value *= 0.5
+        return value
+
+    return sorted(candidates, key=score)
+
+
+async def run_provider(provider: TranslationProvider, client, texts: list[str], source_lang: str, target_lang: str):
+    started = time.monotonic()
+    try:
+        results = await provider.translate_batch(client, texts, source_lang, target_lang)
+    except asyncio.CancelledError:
+        # A hedge loser (or a request past its deadline) says nothing about the provider, and
+        # counting it as a fast success would pull the latency estimate below real calls.
+        raise
+    except Exception:
+        provider.stats.record(time.monotonic() - started, False, len(texts), 0.0)
+        raise
+    provider.stats.record(time.monotonic() - started, True, len(texts), provider.estimate_cost(texts))
+    return results
+
+
+def _extract_json_array(text: str) -> list:
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if not match:
+        raise DeepSeekError("No JSON array found in translation response")
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError as exc:
+        raise DeepSeekError("Failed to parse translation JSON") from exc
+
+
+register_provider(DeepSeekProvider())
+register_provider(MyMemoryProvider())
+register_provider(OfflineProvider())
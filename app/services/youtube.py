@@ -1,13 +1,31 @@
-from datetime import datetime, timezone
+import logging
 from math import log10
 
 from app.core.config import settings
-from app.services.language_match import is_language_match
+from app.services.deadline import deadline_expired, http_timeout
+from app.services.language_match import match_languages
+from app.services.ranking import rank_candidates
+from app.services.records import Comment
+from app.services.resilience import resilient_request
+from app.services.search_coordinator import STATS_BATCH_SIZE, current_coordinator
+from app.services.shared_state import count_usage
+from app.services.store import get_store, is_fresh, latest_published, merge_comments
 
 
-async def search_videos(client, query: str, lang, limit: int = 10) -> list[dict]:
+SEARCH_QUOTA_COST = 100
+
+logger = logging.getLogger("app.youtube")
+
+
+async def search_videos(
+    client,
+    query: str,
+    lang,
+    limit: int = 10,
+    published_after: str | None = None,
+) -> list[dict]:
     if settings.youtube_api_key:
-        return await _search_youtube_api(client, query, lang, limit=limit)
+        return await _search_youtube_api(client, query, lang, limit=limit, published_after=published_after)
     fallback = await _search_invidious_fallback(client, query)
     return [fallback] if fallback else []
 
@@ -17,13 +35,49 @@ async def search_video(client, query: str, lang) -> dict | None:
     return videos[0] if videos else None
 
 
-async def fetch_comments(client, video_id: str, lang, max_results: int = 60) -> list[dict]:
+async def fetch_comments(client, video_id: str, lang, max_results: int = 60) -> list[Comment]:
+    coordinator = current_coordinator()
+    if coordinator is None:
+        return await _fetch_comments_for_lang(client, video_id, lang, max_results)
+    return await coordinator.comments(
+        video_id,
+        lang.key,
+        lambda: _fetch_comments_for_lang(client, video_id, lang, max_results),
+    )
+
+
+async def _fetch_comments_for_lang(client, video_id: str, lang, max_results: int) -> list[Comment]:
+    store = get_store()
+    if store is None:
+        return await _fetch_comments_upstream(client, video_id, max_results=max_results)
+
+    stored, fetched_at = await store.load_comments(video_id, lang.key)
+    if stored and is_fresh(fetched_at):
+        return stored
+    if not stored:
+        return await _fetch_comments_upstream(client, video_id, max_results=max_results)
+
+    since = latest_published(stored)
+    if not since or not settings.youtube_api_key:
+        fresh = await _fetch_comments_upstream(client, video_id, max_results=max_results)
+    else:
+        fresh = await _fetch_comments_api(client, video_id, max_results=100, since=since)
+    return merge_comments(stored, fresh)
+
+
+async def _fetch_comments_upstream(client, video_id: str, max_results: int = 60) -> list[Comment]:
     if settings.youtube_api_key:
         return await _fetch_comments_api(client, video_id, max_results=max_results)
     return await _fetch_comments_invidious_fallback(client, video_id, limit=10)
 
 
-async def _search_youtube_api(client, query: str, lang, limit: int = 10) -> list[dict]:
+async def _search_youtube_api(
+    client,
+    query: str,
+    lang,
+    limit: int = 10,
+    published_after: str | None = None,
+) -> list[dict]:
     max_results = min(50, max(10, limit))
     params = {
         "part": "snippet",
@@ -36,7 +90,16 @@ async def _search_youtube_api(client, query: str, lang, limit: int = 10) -> list
         "fields": "items/id/videoId",
         "key": settings.youtube_api_key,
     }
-    response = await client.get("https://www.googleapis.com/youtube/v3/search", params=params)
+    if published_after:
+        params["publishedAfter"] = published_after
+    response = await resilient_request(
+        client,
+        "youtube",
+        "GET",
+        _youtube_url("search"),
+        params=params,
+        before_attempt=lambda: _spend_quota(SEARCH_QUOTA_COST),
+    )
     response.raise_for_status()
     data = response.json()
     items = data.get("items", [])
@@ -52,23 +115,24 @@ async def _search_youtube_api(client, query: str, lang, limit: int = 10) -> list
     if not ranked_ids:
         return []
 
-    video_ids = ",".join([vid for vid, _ in ranked_ids])
-    stats = await _fetch_video_stats(client, video_ids)
+    stats = await fetch_video_stats(client, [vid for vid, _ in ranked_ids])
+
+    snippets = [stats.get(video_id, {}).get("snippet", {}) for video_id, _ in ranked_ids]
+    matches = match_languages(
+        lang.key,
+        [f"{snippet.get('title', '')} {snippet.get('channelTitle', '')}" for snippet in snippets],
+    )
 
     candidates = []
-    view_logs = []
-    for video_id, rank in ranked_ids:
+    for (video_id, rank), snippet, match in zip(ranked_ids, snippets, matches):
         info = stats.get(video_id, {})
-        snippet = info.get("snippet", {})
         statistics = info.get("statistics", {})
         published_at = snippet.get("publishedAt")
         view_count = int(statistics.get("viewCount", 0) or 0)
         comment_count = int(statistics.get("commentCount", 0) or 0)
         view_log = log10(view_count + 1)
-        view_logs.append(view_log)
         title = snippet.get("title", "")
         channel = snippet.get("channelTitle", "")
-        match = is_language_match(lang.key, f"{title} {channel}")
         candidates.append(
             {
                 "videoId": video_id,
@@ -84,34 +148,33 @@ async def _search_youtube_api(client, query: str, lang, limit: int = 10) -> list
             }
         )
 
-    max_view_log = max(view_logs) if view_logs else 0.0
-    for item in candidates:
-        item["score"] = _score_video(
-            item["viewLog"],
-            max_view_log,
-            item.get("publishedAt"),
-            item.get("rank", 0),
-        )
-        if item.get("commentCount", 0) > 0:
-            item["score"] += 0.08
-        if item.get("langMatch"):
-            item["score"] += 0.12
-
-    candidates.sort(key=lambda x: x.get("score", 0), reverse=True)
-    return candidates[:limit]
+    return rank_candidates(candidates, limit)
 
 
-async def _fetch_comments_api(client, video_id: str, max_results: int = 60) -> list[dict]:
+async def _fetch_comments_api(
+    client,
+    video_id: str,
+    max_results: int = 60,
+    since: str | None = None,
+) -> list[Comment]:
     params = {
         "part": "snippet",
         "videoId": video_id,
         "maxResults": max_results,
-        "order": "relevance",
+        "order": "time" if since else "relevance",
         "textFormat": "plainText",
-        "fields": "items(snippet/topLevelComment/snippet(textDisplay,textOriginal,likeCount))",
+        "fields": "items(id,snippet/topLevelComment/snippet(textDisplay,textOriginal,likeCount,publishedAt))",
         "key": settings.youtube_api_key,
     }
-    response = await client.get("https://www.googleapis.com/youtube/v3/commentThreads", params=params)
+    response = await resilient_request(
+        client,
+        "youtube",
+        "GET",
+        _youtube_url("commentThreads"),
+        params=params,
+        hedge=True,
+        before_attempt=lambda: count_usage("youtube", 1),
+    )
     if response.status_code == 403:
         return []
     response.raise_for_status()
@@ -121,9 +184,19 @@ async def _fetch_comments_api(client, video_id: str, max_results: int = 60) -> l
     for item in items:
         snippet = item.get("snippet", {}).get("topLevelComment", {}).get("snippet", {})
         text = snippet.get("textDisplay") or snippet.get("textOriginal")
+        published_at = snippet.get("publishedAt", "")
+        if since and published_at and published_at <= since:
+            break
         if text:
-            results.append({"original": text, "likeCount": int(snippet.get("likeCount", 0) or 0)})
-    results.sort(key=lambda x: x.get("likeCount", 0), reverse=True)
+            results.append(
+                Comment(
+                    text,
+                    int(snippet.get("likeCount", 0) or 0),
+                    comment_id=item.get("id", ""),
+                    published_at=published_at,
+                )
+            )
+    results.sort(key=lambda x: x.like_count, reverse=True)
     return results
 
 
@@ -131,8 +204,14 @@ async def _search_invidious_fallback(client, query: str) -> dict | None:
     params = {"q": query, "type": "video", "sort_by": "relevance"}
     last_error = None
     for base_url in settings.invidious_instances:
+        if deadline_expired():
+            break
         try:
-            response = await client.get(f"{base_url.rstrip('/')}/api/v1/search", params=params)
+            response = await client.get(
+                f"{base_url.rstrip('/')}/api/v1/search",
+                params=params,
+                timeout=http_timeout(),
+            )
             if response.status_code >= 400:
                 last_error = response.status_code
                 continue
@@ -157,13 +236,16 @@ async def _search_invidious_fallback(client, query: str) -> dict | None:
     return None
 
 
-async def _fetch_comments_invidious_fallback(client, video_id: str, limit: int = 10) -> list[dict]:
+async def _fetch_comments_invidious_fallback(client, video_id: str, limit: int = 10) -> list[Comment]:
     from bs4 import BeautifulSoup
     for base_url in settings.invidious_instances:
+        if deadline_expired():
+            break
         try:
             response = await client.get(
                 f"{base_url.rstrip('/')}/api/v1/comments/{video_id}",
                 params={"sort_by": "top"},
+                timeout=http_timeout(),
             )
             if response.status_code >= 400:
                 continue
@@ -175,14 +257,34 @@ async def _fetch_comments_invidious_fallback(client, video_id: str, limit: int =
                 if content:
                     cleaned = BeautifulSoup(content, "html.parser").get_text(" ", strip=True)
                     if cleaned:
-                        results.append({"original": cleaned, "likeCount": int(item.get("likeCount", 0) or 0)})
-            results.sort(key=lambda x: x.get("likeCount", 0), reverse=True)
+                        results.append(
+                            Comment(
+                                cleaned,
+                                int(item.get("likeCount", 0) or 0),
+                                comment_id=item.get("commentId", ""),
+                            )
+                        )
+            results.sort(key=lambda x: x.like_count, reverse=True)
             return results[:limit]
         except Exception:
             continue
     return []
 
 
+async def fetch_video_stats(client, video_ids: list[str]) -> dict:
+    coordinator = current_coordinator()
+    if coordinator is not None:
+        return await coordinator.video_stats(client, video_ids, _fetch_video_stats_batched)
+    return await _fetch_video_stats_batched(client, video_ids)
+
+
+async def _fetch_video_stats_batched(client, video_ids: list[str]) -> dict:
+    results = {}
+    for start in range(0, len(video_ids), STATS_BATCH_SIZE):
+        results.update(await _fetch_video_stats(client, ",".join(video_ids[start : start + STATS_BATCH_SIZE])))
+    return results
+
+
 async def _fetch_video_stats(client, video_ids: str) -> dict:
     params = {
         "part": "snippet,statistics",
@@ -190,8 +292,18 @@ async def _fetch_video_stats(client, video_ids: str) -> dict:
         "fields": "items(id,snippet(title,channelTitle,publishedAt),statistics(viewCount,commentCount))",
         "key": settings.youtube_api_key,
     }
-    response = await client.get("https://www.googleapis.com/youtube/v3/videos", params=params)
+    response = await resilient_request(
+        client,
+        "youtube",
+        "GET",
+        _youtube_url("videos"),
+        params=params,
+        hedge=True,
+        before_attempt=lambda: count_usage("youtube", 1),
+    )
     if response.status_code >= 400:
+        # Ranking degrades to relevance order without stats; keep the language alive.
+        logger.warning("video stats unavailable", extra={"status": response.status_code, "videos": video_ids})
         return {}
     data = response.json()
     results = {}
@@ -200,20 +312,11 @@ async def _fetch_video_stats(client, video_ids: str) -> dict:
     return results
 
 
-def _score_video(view_log: float, max_view_log: float, published_at: str | None, rank: int) -> float:
-    view_score = (view_log / max_view_log) if max_view_log > 0 else 0.0
-    recency_score = 0.0
-    if published_at:
-        try:
-            published = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-            days = (datetime.now(timezone.utc) - published).days
-            if days < 0:
-                days = 0
-            recency_score = max(0.0, 1.0 - min(days, 365) / 365)
-        except ValueError:
-            recency_score = 0.0
-    relevance_score = 1.0 / (rank + 1)
-    score = view_score * 0.6 + relevance_score * 0.25 + recency_score * 0.15
-    if view_score < 0.15:
-        score -= 0.05
-    return score
+async def _spend_quota(units: int) -> None:
+    used = await count_usage("youtube", units)
+    if settings.youtube_daily_quota and used > settings.youtube_daily_quota:
+        raise RuntimeError("YouTube API 每日配额已达上限 (403)")
+
+
+def _youtube_url(endpoint: str) -> str:
+    return f"{settings.youtube_api_base_url.rstrip('/')}/{endpoint}"
@@ -0,0 +1,83 @@
+"""Benchmark duplicate comment detection throughput.
+
+Times the two stages separately: the exact collapse that runs before translation
+(collapse_duplicates) and the MinHash near-duplicate grouping that only feeds
+summary weights (find_duplicate_groups).
+
+Run with: python -m benchmarks.dedup_bench [--comments N] [--duplicate-ratio R]
+"""
+
+import argparse
+import random
+import time
+
+from app.services.dedup import collapse_duplicates, find_duplicate_groups
+from app.services.records import Comment
+
+
+SYLLABLES = {
+    "en": "ba ce di fo gu ha je ki lo mu na pe qui ro su ta ve wi xo yu ze".split(),
+    "es": "ca da fe ga la ma na ña pa ra sa ta va ya za ción dad mente".split(),
+    "de": "ber chen der ein ge hei keit lich mann nach sch ste tung ung ver zei".split(),
+    "ja": "あ い う え お か き く け こ さ し す せ そ た ち つ て と な に の は ま".split(),
+    "zh": "战 争 新 闻 人 们 国 家 价 格 政 府 真 的 认 为 历 史 世 界 同 意 从 来".split(),
+}
+
+
+def _word(rng: random.Random, lang: str) -> str:
+    return "".join(rng.choice(SYLLABLES[lang]) for _ in range(rng.randint(1, 3)))
+
+
+def synthetic_comments(count: int, duplicate_ratio: float, seed: int = 11) -> list[str]:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        if texts and rng.random() < duplicate_ratio:
+            source = rng.choice(texts)
+            variant = rng.choice(
+                [
+                    source,
+                    source + "!!",
+                    source.upper(),
+                    source.replace(" ", "  "),
+                    source + " " + rng.choice(["lol", "😂", "+1", "100%"]),
+                ]
+            )
+            texts.append(variant)
+            continue
+        lang = rng.choice(list(SYLLABLES))
+        separator = "" if lang in {"ja", "zh"} else " "
+        texts.append(separator.join(_word(rng, lang) for _ in range(rng.randint(6, 30))))
+    return texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--comments", type=int, default=5000)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.3)
+    args = parser.parse_args()
+
+    texts = synthetic_comments(args.comments, args.duplicate_ratio)
+    comments = [Comment(original=text) for text in texts]
+    start = time.perf_counter()
+    kept = collapse_duplicates(comments)
+    collapse_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    groups = find_duplicate_groups(texts)
+    similar_elapsed = time.perf_counter() - start
+
+    similar = len(set(groups))
+    print(f"comments: {len(texts)}")
+    print(
+        f"exact collapse (before translation)  kept: {len(kept)}  collapsed: {len(texts) - len(kept)}  "
+        f"elapsed: {collapse_elapsed * 1000:.1f} ms  throughput: {len(texts) / collapse_elapsed:,.0f} comments/s"
+    )
+    print(
+        f"near-duplicate groups (summary weights only)  groups: {similar}  grouped: {len(texts) - similar}  "
+        f"elapsed: {similar_elapsed * 1000:.1f} ms  throughput: {len(texts) / similar_elapsed:,.0f} comments/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
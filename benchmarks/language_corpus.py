@@ -0,0 +1,209 @@
+"""Labelled text used to build and evaluate the language identification profiles.
+
+TRAINING feeds ``python -m benchmarks.language_id_bench --build``; EVALUATION is
+held out and only used for the accuracy report.
+"""
+
+TRAINING = {
+    "en": """
+I think this is the best explanation of the situation I have seen so far.
+Nobody is talking about what happens to the people who actually live there.
+The government should have done something about this years ago, but they never listen.
+Honestly I was not expecting the prices to go up this fast, it is getting really hard to pay the rent.
+This video deserves way more views, thank you for making it so clear and easy to understand.
+I don't know why everyone is so surprised, we have been warning about this for a long time.
+My grandfather used to say that history always repeats itself and he was right.
+What a great interview, the journalist asked all the questions that matter.
+It would be nice if the news would show both sides instead of just one story.
+We went there last summer and the people were very friendly and welcoming.
+Can someone explain why the numbers in the report are so different from last year?
+The comments here are more informative than most of the articles I have read.
+They keep saying that everything is fine while the shops are closing one after another.
+I have been following this channel for years and the quality just keeps getting better.
+The problem is not the technology itself but how the companies are using it.
+Would love to see a follow up on this topic with more data from other countries.
+This is exactly what my teacher was trying to tell us in school and nobody believed her.
+It is sad to see how quickly people forget what happened before.
+Thank you for the translation, it really helps people who are not from here.
+I wish our leaders would spend more time solving problems and less time arguing on television.
+""",
+    "de": """
+Ich finde es gut, dass endlich jemand über dieses Thema spricht.
+Die Regierung hätte schon vor Jahren etwas unternehmen müssen, aber es ist nichts passiert.
+Das ist die beste Erklärung, die ich bisher zu dieser Situation gesehen habe.
+Ehrlich gesagt habe ich nicht erwartet, dass die Preise so schnell steigen, die Miete ist kaum noch bezahlbar.
+Dieses Video verdient viel mehr Aufrufe, danke für die klare und verständliche Darstellung.
+Ich weiß nicht, warum alle so überrascht sind, wir haben seit langer Zeit davor gewarnt.
+Mein Großvater hat immer gesagt, dass sich die Geschichte wiederholt, und er hatte recht.
+Was für ein tolles Interview, der Journalist hat genau die richtigen Fragen gestellt.
+Es wäre schön, wenn die Nachrichten beide Seiten zeigen würden und nicht nur eine Geschichte.
+Wir waren letzten Sommer dort und die Menschen waren sehr freundlich und offen.
+Kann mir jemand erklären, warum die Zahlen im Bericht so anders sind als letztes Jahr?
+Die Kommentare hier sind informativer als die meisten Artikel, die ich gelesen habe.
+Sie sagen immer, dass alles in Ordnung ist, während ein Geschäft nach dem anderen schließt.
+Ich folge diesem Kanal seit Jahren und die Qualität wird einfach immer besser.
+Das Problem ist nicht die Technik selbst, sondern wie die Unternehmen sie benutzen.
+Ich würde mich über eine Fortsetzung mit mehr Daten aus anderen Ländern freuen.
+Genau das wollte uns unsere Lehrerin in der Schule erklären und niemand hat ihr geglaubt.
+Es ist traurig zu sehen, wie schnell die Leute vergessen, was früher passiert ist.
+Vielen Dank für die Übersetzung, das hilft wirklich allen, die nicht von hier sind.
+Ich wünschte, unsere Politiker würden mehr Zeit mit der Lösung von Problemen verbringen und weniger im Fernsehen streiten.
+""",
+    "fr": """
+Je trouve ça bien que quelqu'un parle enfin de ce sujet.
+Le gouvernement aurait dû faire quelque chose il y a des années, mais rien n'a changé.
+C'est la meilleure explication de la situation que j'ai vue jusqu'à présent.
+Honnêtement je ne pensais pas que les prix allaient augmenter aussi vite, le loyer devient impossible à payer.
+Cette vidéo mérite beaucoup plus de vues, merci pour cette présentation claire et facile à comprendre.
+Je ne sais pas pourquoi tout le monde est surpris, on nous prévient depuis longtemps.
+Mon grand-père disait toujours que l'histoire se répète et il avait raison.
+Quelle belle interview, le journaliste a posé toutes les questions qui comptent vraiment.
+Ce serait bien que les informations montrent les deux côtés au lieu d'une seule version.
+Nous y sommes allés l'été dernier et les gens étaient très gentils et accueillants.
+Est-ce que quelqu'un peut expliquer pourquoi les chiffres du rapport sont si différents de l'année dernière ?
+Les commentaires ici sont plus instructifs que la plupart des articles que j'ai lus.
+Ils répètent que tout va bien pendant que les magasins ferment les uns après les autres.
+Je suis cette chaîne depuis des années et la qualité ne cesse de s'améliorer.
+Le problème n'est pas la technologie elle-même mais la façon dont les entreprises l'utilisent.
+J'aimerais beaucoup voir une suite sur ce thème avec des données d'autres pays.
+C'est exactement ce que notre professeur essayait de nous dire à l'école et personne ne la croyait.
+C'est triste de voir à quel point les gens oublient vite ce qui s'est passé avant.
+Merci pour la traduction, cela aide vraiment ceux qui ne sont pas d'ici.
+J'aimerais que nos dirigeants passent plus de temps à résoudre les problèmes et moins à se disputer à la télévision.
+""",
+    "es": """
+Me parece bien que por fin alguien hable de este tema.
+El gobierno tendría que haber hecho algo hace años, pero nunca escuchan a la gente.
+Es la mejor explicación de la situación que he visto hasta ahora.
+Sinceramente no esperaba que los precios subieran tan rápido, cada vez es más difícil pagar el alquiler.
+Este vídeo merece muchas más visitas, gracias por explicarlo de una forma tan clara y sencilla.
+No sé por qué todos están tan sorprendidos, llevamos mucho tiempo avisando de esto.
+Mi abuelo siempre decía que la historia se repite y tenía toda la razón.
+Qué buena entrevista, el periodista hizo todas las preguntas que importan.
+Estaría bien que las noticias mostraran las dos partes y no solo una versión.
+Estuvimos allí el verano pasado y la gente fue muy amable y acogedora.
+¿Alguien puede explicar por qué los números del informe son tan diferentes a los del año pasado?
+Los comentarios aquí son más informativos que la mayoría de los artículos que he leído.
+Siguen diciendo que todo está bien mientras las tiendas cierran una tras otra.
+Llevo años siguiendo este canal y la calidad no para de mejorar.
+El problema no es la tecnología en sí sino cómo la usan las empresas.
+Me encantaría ver una continuación sobre este tema con datos de otros países.
+Esto es exactamente lo que nuestra profesora intentaba decirnos en la escuela y nadie le creía.
+Es triste ver lo rápido que la gente olvida lo que pasó antes.
+Gracias por la traducción, de verdad ayuda a quienes no somos de aquí.
+Ojalá nuestros políticos dedicaran más tiempo a resolver problemas y menos a pelearse en la televisión.
+""",
+    "pt": """
+Acho muito bom que finalmente alguém esteja falando sobre esse assunto.
+O governo deveria ter feito alguma coisa há anos, mas eles nunca escutam o povo.
+Essa é a melhor explicação da situação que eu vi até agora.
+Sinceramente não esperava que os preços subissem tão rápido, está cada vez mais difícil pagar o aluguel.
+Esse vídeo merece muito mais visualizações, obrigado por explicar de um jeito tão claro e simples.
+Não sei por que todo mundo está tão surpreso, estamos avisando sobre isso há muito tempo.
+Meu avô sempre dizia que a história se repete e ele tinha razão.
+Que entrevista boa, o jornalista fez todas as perguntas que importam de verdade.
+Seria legal se os jornais mostrassem os dois lados em vez de uma versão só.
+Nós fomos lá no verão passado e as pessoas foram muito simpáticas e acolhedoras.
+Alguém pode explicar por que os números do relatório estão tão diferentes do ano passado?
+Os comentários aqui são mais informativos do que a maioria das matérias que eu li.
+Eles continuam dizendo que está tudo bem enquanto as lojas fecham uma atrás da outra.
+Acompanho esse canal há anos e a qualidade só melhora.
+O problema não é a tecnologia em si, mas como as empresas estão usando ela.
+Adoraria ver uma continuação sobre esse tema com dados de outros países.
+Isso é exatamente o que nossa professora tentava nos dizer na escola e ninguém acreditava nela.
+É triste ver como as pessoas esquecem rápido o que aconteceu antes.
+Obrigado pela tradução, ajuda muito quem não é daqui.
+Queria que nossos políticos passassem mais tempo resolvendo problemas e menos tempo brigando na televisão.
+""",
+    "zh": """
+我觉得终于有人愿意讨论这个话题了，真的很难得。
+政府几年前就应该采取行动，但是一直没有人听老百姓的声音。
+这是我目前看到的对这个局势最清楚的解释。
+说实话我没想到物价涨得这么快，房租越来越难交了。
+这个视频值得更多人看到，谢谢你讲得这么清楚易懂。
+不知道为什么大家这么惊讶，我们很早以前就提醒过了。
+我爷爷常说历史总是在重复，他说得没错。
+这次采访非常好，记者问的都是真正重要的问题。
+希望新闻能够把双方的观点都展示出来，而不是只讲一个故事。
+评论区比大部分文章都有信息量，学到了很多。
+""",
+    "ja": """
+やっと誰かがこの話題について話してくれて本当によかったと思います。
+政府は何年も前に対策をするべきだったのに、結局何も変わりませんでした。
+これは今まで見た中で一番わかりやすい説明です。
+正直こんなに早く物価が上がるとは思っていなかったので、家賃を払うのが大変です。
+この動画はもっと多くの人に見てもらうべきです、丁寧な説明をありがとうございます。
+なぜみんながそんなに驚いているのかわかりません、ずっと前から言われていたことです。
+祖父はいつも歴史は繰り返すと言っていましたが、その通りでした。
+素晴らしいインタビューでした、記者が大事な質問をすべてしてくれました。
+ニュースは片方の話だけではなく、両方の意見を伝えてほしいです。
+コメント欄のほうが多くの記事よりも勉強になります。
+""",
+    "ko": """
+드디어 누군가 이 주제에 대해 이야기해 줘서 정말 다행이라고 생각합니다.
+정부는 몇 년 전에 뭔가를 했어야 했는데 결국 아무것도 바뀌지 않았어요.
+지금까지 본 것 중에서 이 상황에 대한 가장 좋은 설명입니다.
+솔직히 물가가 이렇게 빨리 오를 줄은 몰랐고 월세 내기가 점점 힘들어지고 있어요.
+이 영상은 훨씬 더 많은 사람들이 봐야 합니다, 쉽게 설명해 주셔서 감사합니다.
+왜 다들 그렇게 놀라는지 모르겠어요, 오래전부터 경고했던 일입니다.
+할아버지께서는 항상 역사는 반복된다고 말씀하셨는데 그 말이 맞았어요.
+정말 좋은 인터뷰였습니다, 기자가 중요한 질문을 모두 해 주었어요.
+뉴스가 한쪽 이야기만 하지 말고 양쪽 의견을 모두 보여 주면 좋겠습니다.
+댓글이 대부분의 기사보다 더 유익하네요.
+""",
+}
+
+EVALUATION = [
+    ("en", "This is exactly why I stopped watching the evening news"),
+    ("en", "Great video, but you forgot to mention the second election"),
+    ("en", "Prices in my town have doubled since last year and wages have not moved"),
+    ("en", "Who else is watching this after the announcement yesterday?"),
+    ("en", "The reporter was clearly not prepared for that answer"),
+    ("en", "I live near the border and nobody here believes the official numbers"),
+    ("en", "Thanks for sharing, this helped me understand what is going on"),
+    ("en", "They should have asked the workers before changing the rules"),
+    ("de", "Genau deshalb schaue ich keine Abendnachrichten mehr"),
+    ("de", "Tolles Video, aber die zweite Wahl hast du vergessen zu erwähnen"),
+    ("de", "Die Preise in meiner Stadt haben sich seit letztem Jahr verdoppelt und die Löhne nicht"),
+    ("de", "Wer schaut das hier noch nach der Ankündigung von gestern?"),
+    ("de", "Der Reporter war auf diese Antwort offensichtlich nicht vorbereitet"),
+    ("de", "Ich wohne an der Grenze und hier glaubt niemand den offiziellen Zahlen"),
+    ("de", "Danke fürs Teilen, jetzt verstehe ich endlich, was los ist"),
+    ("de", "Man hätte die Arbeiter fragen sollen, bevor man die Regeln ändert"),
+    ("fr", "C'est exactement pour ça que j'ai arrêté de regarder le journal du soir"),
+    ("fr", "Super vidéo, mais tu as oublié de parler de la deuxième élection"),
+    ("fr", "Les prix dans ma ville ont doublé depuis l'année dernière et les salaires n'ont pas bougé"),
+    ("fr", "Qui regarde encore ça après l'annonce d'hier ?"),
+    ("fr", "Le journaliste n'était clairement pas prêt pour cette réponse"),
+    ("fr", "J'habite près de la frontière et personne ici ne croit les chiffres officiels"),
+    ("fr", "Merci pour le partage, ça m'a aidé à comprendre ce qui se passe"),
+    ("fr", "Ils auraient dû demander aux travailleurs avant de changer les règles"),
+    ("es", "Por eso mismo dejé de ver el telediario de la noche"),
+    ("es", "Muy buen vídeo, pero se te olvidó mencionar la segunda elección"),
+    ("es", "Los precios en mi ciudad se han duplicado desde el año pasado y los sueldos siguen igual"),
+    ("es", "¿Quién más está viendo esto después del anuncio de ayer?"),
+    ("es", "El periodista claramente no estaba preparado para esa respuesta"),
+    ("es", "Vivo cerca de la frontera y aquí nadie se cree las cifras oficiales"),
+    ("es", "Gracias por compartir, me ayudó a entender lo que está pasando"),
+    ("es", "Deberían haber preguntado a los trabajadores antes de cambiar las reglas"),
+    ("pt", "É exatamente por isso que parei de assistir o jornal da noite"),
+    ("pt", "Vídeo muito bom, mas você esqueceu de falar da segunda eleição"),
+    ("pt", "Os preços na minha cidade dobraram desde o ano passado e os salários continuam iguais"),
+    ("pt", "Quem mais está assistindo isso depois do anúncio de ontem?"),
+    ("pt", "O repórter claramente não estava preparado para essa resposta"),
+    ("pt", "Moro perto da fronteira e aqui ninguém acredita nos números oficiais"),
+    ("pt", "Obrigado por compartilhar, me ajudou a entender o que está acontecendo"),
+    ("pt", "Deveriam ter perguntado aos trabalhadores antes de mudar as regras"),
+    ("zh", "这就是我不再看晚间新闻的原因"),
+    ("zh", "视频很好，但是忘了提第二次选举"),
+    ("zh", "我们城市的物价比去年翻了一倍，工资却没涨"),
+    ("zh", "还有谁是看了昨天的公告之后来的？"),
+    ("ja", "だから夜のニュースを見るのをやめました"),
+    ("ja", "いい動画ですが、二回目の選挙について触れていませんね"),
+    ("ja", "うちの街の物価は去年の二倍になったのに給料は変わりません"),
+    ("ja", "昨日の発表の後にこれを見ている人いますか？"),
+    ("ko", "바로 이래서 저녁 뉴스를 안 보게 됐어요"),
+    ("ko", "좋은 영상이지만 두 번째 선거 얘기를 빠뜨렸네요"),
+    ("ko", "우리 동네 물가는 작년보다 두 배가 됐는데 월급은 그대로예요"),
+    ("ko", "어제 발표 보고 이 영상 보러 온 사람 있나요?"),
+]
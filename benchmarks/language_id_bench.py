@@ -0,0 +1,109 @@
+"""Benchmark the n-gram language identifier: accuracy on held-out text and throughput.
+
+Run with: python -m benchmarks.language_id_bench [--texts N] [--build]
+
+--build regenerates app/services/language_profiles.json from benchmarks/language_corpus.py.
+"""
+
+import argparse
+import json
+import re
+import time
+from collections import Counter
+
+from app.services import language_match
+from benchmarks.language_corpus import EVALUATION, TRAINING
+
+
+KANA = re.compile(r"[\u3040-\u30ff]")
+CJK = re.compile(r"[\u4e00-\u9fff]")
+HANGUL = re.compile(r"[\uac00-\ud7af]")
+NON_LATIN = re.compile(r"[\u4e00-\u9fff\u3040-\u30ff\uac00-\ud7af\u0400-\u04ff]")
+LATIN = re.compile(r"[A-Za-z]")
+
+
+def legacy_is_language_match(lang_key: str, text: str) -> bool:
+    sample = text.strip()
+    if not sample:
+        return True
+    if lang_key == "ja":
+        return bool(KANA.search(sample)) or (bool(CJK.search(sample)) and not HANGUL.search(sample))
+    if lang_key == "zh":
+        return bool(CJK.search(sample))
+    if lang_key == "ko":
+        return bool(HANGUL.search(sample))
+    non_latin_count = len(NON_LATIN.findall(sample))
+    latin_count = len(LATIN.findall(sample))
+    if len(sample) < 6:
+        return not (non_latin_count >= 1 and latin_count == 0)
+    return not (non_latin_count >= 3 and latin_count <= 2)
+
+
+def build() -> None:
+    profiles = language_match.build_profiles(TRAINING)
+    language_match.PROFILE_PATH.write_text(
+        json.dumps(profiles, ensure_ascii=False, separators=(",", ":")) + "\n",
+        encoding="utf-8",
+    )
+    language_match.load_profiles.cache_clear()
+    size = language_match.PROFILE_PATH.stat().st_size
+    print(f"wrote {language_match.PROFILE_PATH} ({size / 1024:.1f} KiB)")
+
+
+def rejection_rate(matcher, lang_keys: list[str]) -> float:
+    pairs = [(key, text) for lang, text in EVALUATION for key in lang_keys if key != lang]
+    rejected = sum(1 for key, text in pairs if not matcher(key, text))
+    return rejected / len(pairs)
+
+
+def report_accuracy() -> None:
+    texts = [text for _, text in EVALUATION]
+    detections = language_match.detect_languages(texts)
+    confusion = Counter()
+    correct = 0
+    for (expected, _), detection in zip(EVALUATION, detections):
+        correct += detection.lang == expected
+        if detection.lang != expected:
+            confusion[(expected, detection.lang)] += 1
+    print(f"accuracy: {correct}/{len(EVALUATION)} ({correct / len(EVALUATION):.1%})")
+    for (expected, actual), count in confusion.most_common():
+        print(f"  {expected} -> {actual}: {count}")
+
+    same_language = sum(1 for lang, text in EVALUATION if language_match.is_language_match(lang, text))
+    print(f"own-language comments kept: {same_language}/{len(EVALUATION)}")
+    latin = list(language_match.SCRIPT_LANGUAGES["latin"])
+    print(
+        "off-language Latin comments rejected: "
+        f"legacy {rejection_rate(legacy_is_language_match, latin):.1%}, "
+        f"n-gram {rejection_rate(language_match.is_language_match, latin):.1%}"
+    )
+
+
+def report_throughput(count: int) -> None:
+    texts = [f"{EVALUATION[index % len(EVALUATION)][1]} {index}" for index in range(count)]
+    start = time.perf_counter()
+    language_match.detect_languages(texts)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        legacy_is_language_match("en", text)
+    legacy_elapsed = time.perf_counter() - start
+
+    print(f"throughput: {count / elapsed:,.0f} texts/s (legacy script regex: {count / legacy_elapsed:,.0f} texts/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--build", action="store_true")
+    args = parser.parse_args()
+
+    if args.build:
+        build()
+    report_accuracy()
+    report_throughput(args.texts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Load-test /api/video offline against the mock upstream server.
+
+Starts ``benchmarks.mock_upstream`` on a local port, points the app settings at
+it and drives ``app.main`` in-process with concurrent requests.
+
+Run with: python -m benchmarks.load_bench [--requests N] [--concurrency N]
+          [--latency-ms MS] [--error-rate R] [--comments] [--profile out.prof]
+          python -m benchmarks.load_bench --memory [--requests N]
+
+--memory runs the requests one at a time under tracemalloc and reports the peak
+traced bytes per /api/video request, the bytes still held afterwards (caches and
+result handles) and the allocation sites holding the most memory at the end.
+"""
+
+import argparse
+import asyncio
+import cProfile
+import gc
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
+from dataclasses import fields
+
+from benchmarks.mock_upstream import MockConfig, mock_settings_env
+
+
+QUERIES = ["inflation", "housing prices", "election debate", "climate policy", "ai regulation", "world cup"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock(config: MockConfig, port: int, timeout: float = 30.0) -> subprocess.Popen:
+    # A separate process keeps the mock's own CPU time out of the app's latencies and profiles.
+    command = [sys.executable, "-m", "benchmarks.mock_upstream", "--port", str(port)]
+    for item in fields(MockConfig):
+        command += [f"--{item.name.replace('_', '-')}", str(getattr(config, item.name))]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stats", timeout=1):
+                return process
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("mock upstream server did not start")
+
+
+def mock_request_counts(port: int) -> dict:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stats", timeout=5) as response:
+        return json.load(response)["requests"]
+
+
+async def drive(total: int, concurrency: int, include_comments: bool, distinct: bool) -> tuple[list[float], dict]:
+    import httpx
+
+    from app.main import app
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def one(index: int) -> None:
+            query = QUERIES[index % len(QUERIES)]
+            if distinct:
+                query = f"{query} {index}"
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post("/api/video", json={"query": query, "include_comments": include_comments})
+                latencies.append(time.perf_counter() - started)
+            key = str(response.status_code)
+            if response.status_code == 200 and response.json().get("partial"):
+                key = "200 partial"
+            statuses[key] = statuses.get(key, 0) + 1
+
+        await asyncio.gather(*(one(index) for index in range(total)))
+    return latencies, statuses
+
+
+async def drive_memory(total: int, include_comments: bool) -> list[tuple[int, int]]:
+    import httpx
+
+    from app.main import app
+
+    samples = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Warm-up request so imports, profiles and connection pools are not billed to the first sample.
+        await client.post("/api/video", json={"query": "warm up"})
+        for index in range(total):
+            query = f"{QUERIES[index % len(QUERIES)]} {index}"
+            gc.collect()
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            response = await client.post("/api/video", json={"query": query, "include_comments": include_comments})
+            response.raise_for_status()
+            del response
+            # Collect reference cycles so "retained" counts only what caches genuinely keep.
+            gc.collect()
+            current, peak = tracemalloc.get_traced_memory()
+            samples.append((peak - baseline, current - baseline))
+    return samples
+
+
+def report_memory(samples: list[tuple[int, int]], snapshot: tracemalloc.Snapshot, top: int = 10) -> None:
+    peaks = sorted(peak for peak, _ in samples)
+    retained = [kept for _, kept in samples]
+    print(f"requests: {len(samples)} (sequential, tracemalloc)")
+    print(
+        f"peak bytes per request  p50: {statistics.median(peaks) / 1024:,.0f} KiB  "
+        f"max: {peaks[-1] / 1024:,.0f} KiB"
+    )
+    print(f"retained bytes per request  mean: {statistics.mean(retained) / 1024:,.0f} KiB")
+    app_only = snapshot.filter_traces([tracemalloc.Filter(True, "*/app/*")])
+    print(f"top {top} allocation sites still held in app/:")
+    for stat in app_only.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        print(f"  {stat.size / 1024:8,.0f} KiB  {stat.count:7d} blocks  {frame.filename}:{frame.lineno}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=6)
+    parser.add_argument(
+        "--comments",
+        action="store_true",
+        help="send include_comments, adding the flat comments array to each response "
+        "(comments are fetched, filtered and translated either way)",
+    )
+    parser.add_argument("--repeat-queries", action="store_true", help="reuse a few queries so caches can hit")
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=600.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--comments-per-video", type=int, default=60)
+    parser.add_argument("--profile", help="write a cProfile dump of the whole run to this path")
+    parser.add_argument("--memory", action="store_true", help="report tracemalloc peak bytes per request instead")
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency_ms=args.latency_ms,
+        llm_latency_ms=args.llm_latency_ms,
+        error_rate=args.error_rate,
+        comments_per_video=args.comments_per_video,
+    )
+    port = free_port()
+    mock = start_mock(config, port)
+
+    # Settings are read at import time, so the environment must be in place before app.main loads.
+    scratch = tempfile.mkdtemp(prefix="load-bench-")
+    os.environ.update(mock_settings_env(f"http://127.0.0.1:{port}"))
+    os.environ.update(
+        {
+            "COMMENT_STORE_PATH": os.path.join(scratch, "comments.sqlite3"),
+            "STATE_BACKEND_URL": "memory://",
+            "RATE_LIMIT_PER_MINUTE": "0",
+            "YOUTUBE_DAILY_QUOTA": "0",
+            "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+        }
+    )
+
+    if args.memory:
+        tracemalloc.start()
+        samples = asyncio.run(drive_memory(args.requests, args.comments))
+        report_memory(samples, tracemalloc.take_snapshot())
+        tracemalloc.stop()
+        mock.terminate()
+        mock.wait(timeout=5)
+        return
+
+    profiler = cProfile.Profile() if args.profile else None
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    latencies, statuses = asyncio.run(
+        drive(args.requests, args.concurrency, args.comments, distinct=not args.repeat_queries)
+    )
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+    elapsed = time.perf_counter() - started
+
+    from app.services.resilience import upstream_metrics
+
+    ordered = sorted(latencies)
+    print(f"requests: {len(latencies)}  concurrency: {args.concurrency}  elapsed: {elapsed:.2f} s")
+    print(f"throughput: {len(latencies) / elapsed:.2f} req/s  statuses: {statuses}")
+    print(
+        f"latency ms  p50: {statistics.median(ordered) * 1000:.0f}  "
+        f"p95: {ordered[int(0.95 * (len(ordered) - 1))] * 1000:.0f}  max: {ordered[-1] * 1000:.0f}"
+    )
+    for name, metrics in sorted(upstream_metrics().items()):
+        print(f"upstream {name}: {metrics}")
+    print(f"mock upstream requests: {mock_request_counts(port)}")
+    if args.profile:
+        print(f"profile written to {args.profile}")
+
+    mock.terminate()
+    mock.wait(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
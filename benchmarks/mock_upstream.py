@@ -0,0 +1,351 @@
+"""Offline stand-in for every upstream the app calls, for load tests and profiling.
+
+Serves the YouTube Data API (search, videos, commentThreads), DeepSeek
+chat/completions (plain, streaming and JSON-array batch translation), MyMemory
+and Invidious from one ASGI app. Responses are synthetic but deterministic per
+query and video; latency, volume and error rate are configurable.
+
+Run with: python -m benchmarks.mock_upstream [--port 8900] [--latency-ms 80] [--error-rate 0.02]
+or:       uvicorn benchmarks.mock_upstream:app --port 8900   (knobs via MOCK_* env vars)
+
+Then point the app at it (see ``mock_settings_env``):
+
+    YOUTUBE_API_BASE_URL=http://127.0.0.1:8900/youtube/v3
+    DEEPSEEK_BASE_URL=http://127.0.0.1:8900/deepseek
+    MYMEMORY_BASE_URL=http://127.0.0.1:8900/mymemory
+    INVIDIOUS_INSTANCES=http://127.0.0.1:8900/invidious
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from benchmarks.language_corpus import TRAINING
+
+
+SHARED_PREFIX = "xx"
+CORPUS_LANGUAGES = sorted(TRAINING)
+SENTENCES = {
+    lang: [line.strip() for line in text.strip().splitlines() if line.strip()]
+    for lang, text in TRAINING.items()
+}
+NOISE = ["😂😂😂", "first!", "+1", "👍", "lol", "Check my channel http://spam.example/free", "www.example.com/promo"]
+SENTIMENTS = ("正面", "中性", "负面")
+BATCH_MARKER = "文本列表："
+SINGLE_MARKER = "文本："
+TARGET_MARKER = "目标语言："
+
+
+@dataclass(frozen=True)
+class MockConfig:
+    latency_ms: float = 80.0
+    latency_sigma: float = 0.5
+    llm_latency_ms: float = 600.0
+    error_rate: float = 0.0
+    videos_per_search: int = 10
+    comments_per_video: int = 60
+    off_language_rate: float = 0.15
+    noise_rate: float = 0.05
+    shared_video_rate: float = 0.2
+    stream_chunk_chars: int = 24
+    seed: int = 7
+
+    @classmethod
+    def from_env(cls) -> "MockConfig":
+        values = {}
+        for item in fields(cls):
+            raw = os.getenv(f"MOCK_{item.name.upper()}")
+            if raw is not None:
+                values[item.name] = type(item.default)(raw)
+        return cls(**values)
+
+
+def mock_settings_env(base_url: str) -> dict[str, str]:
+    base_url = base_url.rstrip("/")
+    return {
+        "YOUTUBE_API_BASE_URL": f"{base_url}/youtube/v3",
+        "YOUTUBE_API_KEY": "mock",
+        "DEEPSEEK_BASE_URL": f"{base_url}/deepseek",
+        "DEEPSEEK_API_KEY": "mock",
+        "MYMEMORY_BASE_URL": f"{base_url}/mymemory",
+        "INVIDIOUS_INSTANCES": f"{base_url}/invidious",
+    }
+
+
+def _rng(config: MockConfig, *parts: object) -> random.Random:
+    digest = hashlib.sha1("\x1f".join(map(str, (config.seed, *parts))).encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def _corpus_lang(code: str | None) -> str:
+    prefix = (code or "en").split("-")[0].lower()
+    return prefix if prefix in SENTENCES else "en"
+
+
+def _video_id(config: MockConfig, query: str, lang: str, index: int) -> str:
+    # The first two characters carry the comment language so videos.list and
+    # commentThreads need no server-side state.
+    digest = hashlib.sha1(f"{config.seed}:{query}:{lang}:{index}".encode("utf-8")).hexdigest()
+    return f"{lang}{digest[:9]}"
+
+
+def _video_lang(video_id: str) -> str | None:
+    prefix = video_id[:2]
+    return prefix if prefix in SENTENCES else None
+
+
+def _published_at(rng: random.Random, after: datetime | None = None) -> str:
+    now = datetime.now(timezone.utc)
+    start = after or now - timedelta(days=30)
+    moment = start + (now - start) * rng.random()
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _comment_text(config: MockConfig, rng: random.Random, lang: str | None) -> str:
+    roll = rng.random()
+    if roll < config.noise_rate:
+        return rng.choice(NOISE)
+    if lang is None or roll < config.noise_rate + config.off_language_rate:
+        lang = rng.choice(CORPUS_LANGUAGES)
+    sentences = SENTENCES[lang]
+    return " ".join(rng.sample(sentences, rng.randint(1, min(3, len(sentences)))))
+
+
+def search_results(config: MockConfig, query: str, lang: str, limit: int, after: datetime | None) -> list[str]:
+    count = min(limit, config.videos_per_search)
+    if after is not None:
+        # Incremental refreshes only see the few videos uploaded since the cutoff.
+        count = max(1, count // 3)
+        query = f"{query}@{after.isoformat()}"
+    rng = _rng(config, "search", query, lang)
+    ids = []
+    for index in range(count):
+        if rng.random() < config.shared_video_rate:
+            ids.append(_video_id(config, query, SHARED_PREFIX, index))
+        else:
+            ids.append(_video_id(config, query, lang, index))
+    return ids
+
+
+@lru_cache(maxsize=4096)
+def video_resource(config: MockConfig, video_id: str) -> dict:
+    rng = _rng(config, "video", video_id)
+    lang = _video_lang(video_id) or rng.choice(CORPUS_LANGUAGES)
+    views = int(rng.lognormvariate(10, 1.5))
+    return {
+        "id": video_id,
+        "snippet": {
+            "title": rng.choice(SENTENCES[lang])[:80],
+            "channelTitle": f"Mock Channel {video_id[-3:]}",
+            "publishedAt": _published_at(rng),
+        },
+        "statistics": {
+            "viewCount": str(views),
+            "likeCount": str(int(views * rng.uniform(0.005, 0.05))),
+            "commentCount": str(int(views * rng.uniform(0.0005, 0.01))),
+        },
+    }
+
+
+@lru_cache(maxsize=4096)
+def comment_threads(config: MockConfig, video_id: str, max_results: int) -> tuple[dict, ...]:
+    rng = _rng(config, "comments", video_id)
+    lang = _video_lang(video_id)
+    items = []
+    for index in range(min(max_results, config.comments_per_video)):
+        text = _comment_text(config, rng, lang)
+        items.append(
+            {
+                "id": f"{video_id}.{index:04d}",
+                "snippet": {
+                    "topLevelComment": {
+                        "snippet": {
+                            "textDisplay": text,
+                            "textOriginal": text,
+                            "likeCount": int(rng.paretovariate(1.2)) - 1,
+                            "publishedAt": _published_at(rng),
+                        }
+                    }
+                },
+            }
+        )
+    # Generating text dominates the mock's CPU time; repeated fetches reuse the payload.
+    return tuple(items)
+
+
+def translate(text: str, target: str) -> str:
+    return f"[{target}] {text}"
+
+
+def chat_reply(config: MockConfig, messages: list[dict]) -> str:
+    prompt = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    target = "zh-CN"
+    if TARGET_MARKER in prompt:
+        target = prompt.split(TARGET_MARKER, 1)[1].splitlines()[0].strip() or target
+    if BATCH_MARKER in prompt:
+        try:
+            texts = json.loads(prompt.split(BATCH_MARKER, 1)[1])
+        except json.JSONDecodeError:
+            texts = []
+        return json.dumps([translate(str(text), target) for text in texts], ensure_ascii=False)
+    if SINGLE_MARKER in prompt:
+        return translate(prompt.split(SINGLE_MARKER, 1)[1], target)
+    rng = _rng(config, "summary", prompt[:2000])
+    return (
+        "核心观点：评论主要围绕话题本身展开，观点分布较为分散。\n"
+        f"情绪倾向：{rng.choice(SENTIMENTS)}\n"
+        "代表性评论：多数用户关注价格与政策变化。"
+    )
+
+
+def create_app(config: MockConfig | None = None) -> FastAPI:
+    config = config or MockConfig.from_env()
+    mock = FastAPI(title="Mock upstreams")
+    mock.state.config = config
+    mock.state.requests = {}
+    failure_rng = random.Random(config.seed)
+
+    @mock.middleware("http")
+    async def simulate(request: Request, call_next):
+        path = request.url.path
+        upstream = path.strip("/").split("/", 1)[0]
+        mock.state.requests[upstream] = mock.state.requests.get(upstream, 0) + 1
+        median = config.llm_latency_ms if upstream == "deepseek" else config.latency_ms
+        if median > 0 and upstream != "_stats":
+            await asyncio.sleep(median * random.lognormvariate(0, config.latency_sigma) / 1000)
+        if upstream != "_stats" and failure_rng.random() < config.error_rate:
+            status = failure_rng.choice((429, 500, 503))
+            headers = {"Retry-After": "1"} if status == 429 else {}
+            return JSONResponse({"error": {"code": status, "message": "mock failure"}}, status, headers=headers)
+        return await call_next(request)
+
+    @mock.get("/_stats")
+    async def stats():
+        return {"requests": mock.state.requests, "config": asdict(config)}
+
+    @mock.get("/youtube/v3/search")
+    async def youtube_search(
+        q: str,
+        maxResults: int = 10,
+        relevanceLanguage: str = "en",
+        publishedAfter: str | None = None,
+    ):
+        ids = search_results(config, q, _corpus_lang(relevanceLanguage), maxResults, _parse_time(publishedAfter))
+        return {"items": [{"id": {"videoId": video_id}} for video_id in ids]}
+
+    @mock.get("/youtube/v3/videos")
+    async def youtube_videos(id: str = ""):
+        return {"items": [video_resource(config, video_id) for video_id in id.split(",") if video_id]}
+
+    @mock.get("/youtube/v3/commentThreads")
+    async def youtube_comments(videoId: str, maxResults: int = 20):
+        return {"items": list(comment_threads(config, videoId, maxResults))}
+
+    @mock.post("/deepseek/chat/completions")
+    async def deepseek_chat(request: Request):
+        payload = await request.json()
+        content = chat_reply(config, payload.get("messages", []))
+        created = int(time.time())
+        if not payload.get("stream"):
+            return {
+                "id": f"mock-{created}",
+                "object": "chat.completion",
+                "created": created,
+                "model": payload.get("model", "mock"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(content), "total_tokens": len(content)},
+            }
+
+        async def events():
+            step = max(1, config.stream_chunk_chars)
+            for start in range(0, len(content), step):
+                chunk = {
+                    "id": f"mock-{created}",
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "choices": [{"index": 0, "delta": {"content": content[start : start + step]}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                await asyncio.sleep(0)
+            done = {"id": f"mock-{created}", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            yield f"data: {json.dumps(done)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @mock.get("/mymemory/get")
+    async def mymemory(q: str, langpair: str = "auto|zh-CN"):
+        target = langpair.split("|")[-1]
+        return {"responseData": {"translatedText": translate(q, target), "match": 1}, "responseStatus": 200}
+
+    @mock.get("/invidious/api/v1/search")
+    async def invidious_search(q: str):
+        ids = search_results(config, q, "en", config.videos_per_search, None)
+        return [
+            {
+                "videoId": video_id,
+                "title": video_resource(config, video_id)["snippet"]["title"],
+                "author": f"Mock Channel {video_id[-3:]}",
+            }
+            for video_id in ids
+        ]
+
+    @mock.get("/invidious/api/v1/comments/{video_id}")
+    async def invidious_comments(video_id: str):
+        comments = []
+        for item in comment_threads(config, video_id, config.comments_per_video):
+            snippet = item["snippet"]["topLevelComment"]["snippet"]
+            comments.append(
+                {"commentId": item["id"], "content": snippet["textOriginal"], "likeCount": snippet["likeCount"]}
+            )
+        return {"comments": comments}
+
+    return mock
+
+
+app = create_app()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    defaults = MockConfig.from_env()
+    for item in fields(MockConfig):
+        parser.add_argument(
+            f"--{item.name.replace('_', '-')}",
+            type=type(item.default),
+            default=getattr(defaults, item.name),
+        )
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = MockConfig(**{item.name: getattr(args, item.name) for item in fields(MockConfig)})
+    print("point the app at this server with:")
+    for key, value in mock_settings_env(f"http://{args.host}:{args.port}").items():
+        print(f"  {key}={value}")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
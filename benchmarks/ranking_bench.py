@@ -0,0 +1,94 @@
+"""Benchmark column-based video ranking against the per-candidate formula.
+
+Run with: python -m benchmarks.ranking_bench [--candidates N] [--rounds N]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from math import log10
+
+from app.services import ranking
+
+
+def legacy_score(item: dict, max_view_log: float) -> float:
+    view_score = (item["viewLog"] / max_view_log) if max_view_log > 0 else 0.0
+    recency_score = 0.0
+    published_at = item.get("publishedAt")
+    if published_at:
+        try:
+            published = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+            days = (datetime.now(timezone.utc) - published).days
+            if days < 0:
+                days = 0
+            recency_score = max(0.0, 1.0 - min(days, 365) / 365)
+        except ValueError:
+            recency_score = 0.0
+    relevance_score = 1.0 / (item.get("rank", 0) + 1)
+    score = view_score * 0.6 + relevance_score * 0.25 + recency_score * 0.15
+    if view_score < 0.15:
+        score -= 0.05
+    if item.get("commentCount", 0) > 0:
+        score += 0.08
+    if item.get("langMatch"):
+        score += 0.12
+    return score
+
+
+def legacy_scores(candidates: list[dict]) -> list[float]:
+    max_view_log = max((item["viewLog"] for item in candidates), default=0.0)
+    return [legacy_score(item, max_view_log) for item in candidates]
+
+
+def synthetic_candidates(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    candidates = []
+    for rank in range(count):
+        view_count = int(10 ** rng.uniform(0, 8))
+        published = now - timedelta(days=rng.uniform(-2, 700), seconds=rng.randint(0, 86399))
+        candidates.append(
+            {
+                "videoId": f"vid{rank}",
+                "publishedAt": "" if rng.random() < 0.05 else published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "viewCount": view_count,
+                "commentCount": rng.choice([0, rng.randint(1, 5000)]),
+                "rank": rank % 50,
+                "viewLog": log10(view_count + 1),
+                "langMatch": rng.random() < 0.7,
+            }
+        )
+    return candidates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candidates", type=int, default=160)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    candidates = synthetic_candidates(args.candidates)
+    expected = legacy_scores(candidates)
+    actual = ranking.score_candidates(candidates)
+    mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+    print(f"backend: {'numpy' if ranking.load_numpy() is not None else 'array'}")
+    print(f"candidates: {len(candidates)}  mismatched scores: {mismatches}")
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        legacy_scores(candidates)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        ranking.score_candidates(candidates)
+    columnar_elapsed = time.perf_counter() - start
+
+    per_round = 1000 / args.rounds
+    print(f"legacy:   {legacy_elapsed * per_round:.3f} ms/round")
+    print(f"columnar: {columnar_elapsed * per_round:.3f} ms/round")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Report import-time cost and time-to-first-response for the ASGI entrypoints.
+
+Run with: python -m benchmarks.startup_bench [--top N] [--runs N]
+"""
+
+import argparse
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from app.core.config import settings
+
+
+ENTRYPOINTS = ["app.asgi:app", "app.main:app"]
+
+
+def import_profile(module: str) -> list[tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        head, cumulative_us, name = line.split("|", 2)
+        self_us = head.split(":", 1)[1].strip()
+        if not self_us.isdigit():
+            continue
+        rows.append((name[1:].rstrip(), int(self_us), int(cumulative_us.strip())))
+    return rows
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_response(entrypoint: str, path: str = "/healthz", timeout: float = 30.0) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", entrypoint, "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.01)
+        raise TimeoutError(f"{entrypoint} did not respond within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = import_profile("app.main")
+    top_level = [row for row in rows if not row[0].startswith(" ")]
+    total_ms = sum(cumulative for _, _, cumulative in top_level) / 1000
+    print(f"import app.main: {total_ms:.0f} ms (budget {settings.startup_budget_ms:.0f} ms)")
+    print("heaviest imports (cumulative):")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[: args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  self {self_us / 1000:7.1f} ms  {name.strip()}")
+
+    print("time to first response:")
+    for entrypoint in ENTRYPOINTS:
+        for path in ("/healthz", "/"):
+            samples = [time_to_first_response(entrypoint, path) for _ in range(args.runs)]
+            print(f"  {entrypoint:14s} {path:9s} best {min(samples) * 1000:7.0f} ms  worst {max(samples) * 1000:7.0f} ms")
+
+    if total_ms > settings.startup_budget_ms:
+        print("startup budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()